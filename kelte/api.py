@@ -8,6 +8,7 @@ from .utils import terminal
 from .fov import handle_view
 from .lighting import handle_lighting
 from .rendering import render_tile, render_entity
+from .tiles import TileFlag
 from .initialization import initialize
 
 
@@ -72,12 +73,14 @@ def cycle():
 
             render_tile(entity.position, old_tile)
             render_tile(new_pos, entity.tile)
-            entity.position = new_pos
+            settings.entities.move(entity, new_pos)
 
-    for entity in settings.entities:
+    # entities in view
+    visible = settings.current_level.tiles.mask(TileFlag.VISIBLE)
+    for position, entity in settings.entities.select(visible):
         render_entity(entity)
 
-    tdl.console_flush()
+    settings.frame.present()
     return done
 
 
@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+from ..config import settings
+from ..procgen.cache import DungeonCache
+from ..utils import terminal
+from ..vendored import click
+
+# Notes:
+#   Seeds are taken as text, exactly as `kelte --seed` passes them on, so
+#   a pack baked for `-s 42` is the one `kelte -s 42` finds.
+
+
+@click.command()
+@click.option("-s", "--seed", "seeds", metavar="SEED", multiple=True, required=True, help="Seed to bake (repeatable).")
+@click.option("-l", "--levels", type=int, default=settings.dungeon_levels, show_default=True, help="Levels per dungeon.")
+@click.option("-W", "--width", type=int, default=settings.map_width, show_default=True, help="Level width.")
+@click.option("-H", "--height", type=int, default=settings.map_height, show_default=True, help="Level height.")
+@click.option("-j", "--processes", type=int, default=0, help="Worker processes (0 uses every cpu).")
+@click.option("-o", "--output", metavar="PATH", default=str(settings.cache_path), show_default=True, help="Cache directory.")
+def bake(seeds, levels, width, height, processes, output):
+    """Pre-generates dungeon packs into the procgen cache"""
+    from ..initialization import find_data
+    from ..items import populate_item_data
+    from ..mobs import populate_mob_data
+    from ..tiles import populate_tile_data
+
+    data = find_data()
+    populate_tile_data(data)
+    populate_mob_data(data)
+    populate_item_data(data)
+
+    cache = DungeonCache(output)
+    for seed in seeds:
+        cached = (seed, width, height, levels) in cache
+        path = cache.bake(seed, width, height, levels, processes=processes)
+        terminal.echo(f"{'Found' if cached else 'Baked'} seed {seed}: {path}")
+
+
+if __name__ == "__main__":
+    bake()
@@ -10,6 +10,10 @@ from ..vendored import click
 #   Pyinstaller seems to build a bad binary on Windows when:
 #     - using upx
 #     - using windowed mode
+#   A one-file binary unpacks everything it bundles on every start.  The
+#   game itself never imports the excluded modules (typeface building and
+#   procgen helpers load them on use), so they are left out.
+excluded_modules = ("scipy", "PIL", "freetype", "fontTools", "fuzzywuzzy")
 
 
 @click.command()
@@ -54,6 +58,7 @@ def build(console, clean, verbose, debug, upx):
             f"--workpath {build_path}",
             f"--log-level {log_level}",
             f"--additional-hooks-dir {hooks_path}",
+            *(f"--exclude-module {module}" for module in excluded_modules),
             str(script_path),
         ]
     )
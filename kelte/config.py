@@ -1,3 +1,4 @@
+import os
 from dataclasses import dataclass, field
 from pathlib import Path
 
@@ -19,6 +20,7 @@ class Settings:
     assets_path: Path = package_path / "assets"
     data_path: Path = assets_path / "data"
     fonts_path: Path = assets_path / "fonts"
+    cache_path: Path = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / pkg_data.name
     version = package_metadata["version"]
 
     # screen data
@@ -26,7 +28,10 @@ class Settings:
     screen_height: int = 50
     title: str = f"Kelte  (v{version})"
     full_screen: bool = False
+    fps: int = 20
     main_console: int = 0
+    root_console: object = None  # actual window; main_console is drawn offscreen
+    frame: object = None  # rendering.FrameBuffer
 
     # typeface
     typeface_name: str = "Deferral-Square"
@@ -53,8 +58,13 @@ class Settings:
     keyboard_bindings = {}
 
     # Map
-    dungeon: list = field(default_factory=list)
+    seed: int = None  # set by initialize_random_seed
+    dungeon: list = field(default_factory=list)  # or a procgen.LazyDungeon
+    dungeon_levels: int = 5
+    dungeon_processes: int = 1  # background workers building deeper levels; 0 builds them on demand
+    dungeon_cache: bool = True  # load dungeons baked with `kelte-bake` when one matches
     current_level: object = None  # actual object
+    entities: object = None  # current_level.entities
 
 
 settings = Settings()
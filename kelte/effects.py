@@ -1,10 +1,10 @@
 # Collection of various effects that can be used independently
 import enum
-import typing
 
 from .ecs import Entity
 from .maths import Position
 from .procgen.levels import Level
+from .spatial import EntityIndex
 
 
 class DamageType(enum.Enum):
@@ -14,16 +14,17 @@ class DamageType(enum.Enum):
     spiritual = 3
 
 
-def electrify(start: Position, end: Position, level: Level, entities: typing.Dict[Position, Entity]):
+def electrify(start: Position, end: Position, level: Level, entities: EntityIndex = None):
+    entities = level.entities if entities is None else entities
     damage_value = 10
     damaged = set()
     for position in start.ray(end):
         if damage_value < 0:
             break
         tile = level[position]
-        if position in entities:
+        entity = entities.get(position)
+        if entity is not None:
             damaged.add(position)
-            entity = entities[position]
             damage(entity, damage_value, DamageType.magical)
             damage_value = damage_value - (damage_value // 2 or 1)
             for neighbor in position.neighbors:
@@ -0,0 +1,195 @@
+import math
+import typing
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+
+from .maths import Position
+from .maths.pathing import SQRT2, padded, relax, step_offsets, steps
+
+# Flow fields
+#   One Dijkstra map per goal set is shared by every mob heading for it.
+#   Each cell also stores the direction of its cheapest neighbor, so a
+#   mob's next step is a single lookup.  When cells change walkability
+#   the field is repaired around them instead of being recomputed.
+
+
+@dataclass(frozen=True)
+class MovementProfile:
+    name: str
+    passable: typing.Callable[[typing.Any], np.ndarray]  # level -> [y, x] mask
+    orthogonal: float = 1.0
+    diagonal: float = SQRT2
+
+
+movement_profiles: typing.Dict[str, MovementProfile] = {
+    "walk": MovementProfile("walk", lambda level: level.walkability),
+}
+
+
+class FlowField:
+    def __init__(
+        self,
+        walkable: np.ndarray,
+        goals: typing.Iterable[Position],
+        orthogonal: float = 1.0,
+        diagonal: float = SQRT2,
+        max_cost: float = None,
+    ):
+        self.height, self.width = walkable.shape
+        self.stride = self.width + 2
+        self.goals = tuple(Position(x, y) for x, y in goals)
+        self.max_cost = max_cost
+        self.offsets = step_offsets(self.stride, orthogonal, diagonal)
+        self.walkable = np.array(walkable, dtype=bool)
+        self.repairs = 0
+
+        self._goal_cells = {
+            self._flat(x, y) for x, y in self.goals if 0 <= x < self.width and 0 <= y < self.height
+        }
+        self._open = padded(self.walkable).ravel().tolist()
+        self._costs = [math.inf] * len(self._open)
+        heap = []
+        for index in self._goal_cells:
+            if self._open[index]:
+                self._costs[index] = 0.0
+                heap.append((0.0, index))
+        relax(self._costs, self._open, heap, self.offsets, max_cost)
+        self._update_directions()
+
+    @property
+    def cost_map(self) -> np.ndarray:
+        """[y, x] cost to the nearest goal; inf where unreachable"""
+        costs = np.array(self._costs).reshape(self.height + 2, self.stride)
+        return costs[1:-1, 1:-1]
+
+    def cost(self, position: Position) -> float:
+        x, y = position
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return math.inf
+        return self._costs[self._flat(x, y)]
+
+    def next_step(self, position: Position) -> Position:
+        """Where a mob at `position` should step next (the position itself
+        at a goal or when no goal can be reached)"""
+        position = Position(*position)
+        x, y = position
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return position
+        direction = self._directions[self._flat(x, y)]
+        if direction < 0:
+            return position
+        return position + steps[direction][0]
+
+    def update(self, walkable: np.ndarray) -> bool:
+        """Repairs the field after cells changed walkability; returns
+        whether anything changed"""
+        walkable = np.asarray(walkable, dtype=bool)
+        changed = walkable != self.walkable
+        if not changed.any():
+            return False
+        opened = self._flat_indices(changed & walkable)
+        closed = self._flat_indices(changed & ~walkable)
+        self.walkable = walkable.copy()
+        costs, open_cells, directions = self._costs, self._open, self._directions
+        for index in opened:
+            open_cells[index] = True
+        for index in closed:
+            open_cells[index] = False
+
+        # everything whose path ran through a closed cell has to be redone
+        stale = set(closed)
+        queue = list(closed)
+        while queue:
+            current = queue.pop()
+            for direction, (offset, _) in enumerate(self.offsets):
+                neighbor = current - offset
+                if directions[neighbor] == direction and neighbor not in stale:
+                    stale.add(neighbor)
+                    queue.append(neighbor)
+        for index in stale:
+            costs[index] = math.inf
+
+        # reseed the stale and opened cells from their settled neighbors
+        max_cost = math.inf if self.max_cost is None else self.max_cost
+        heap = []
+        for index in stale.union(opened):
+            if not open_cells[index]:
+                continue
+            if index in self._goal_cells:
+                cost = 0.0
+            else:
+                cost = min(costs[index - offset] + step_cost for offset, step_cost in self.offsets)
+            if cost < costs[index] and cost <= max_cost:
+                costs[index] = cost
+                heap.append((cost, index))
+        relax(costs, open_cells, heap, self.offsets, self.max_cost)
+        self._update_directions()
+        self.repairs += 1
+        return True
+
+    def _update_directions(self):
+        # each cell points at the neighbor on its cheapest path
+        height, width = self.height, self.width
+        costs = np.array(self._costs).reshape(height + 2, self.stride)
+        best = np.full((height, width), math.inf)
+        directions = np.full((height + 2, self.stride), -1, dtype=np.int8)
+        inner = directions[1:-1, 1:-1]
+        for direction, (((dx, dy), _), (_, step_cost)) in enumerate(zip(steps, self.offsets)):
+            candidate = costs[1 + dy:height + 1 + dy, 1 + dx:width + 1 + dx] + step_cost
+            better = candidate < best
+            best[better] = candidate[better]
+            inner[better] = direction
+        own = costs[1:-1, 1:-1]
+        inner[~(np.isfinite(own) & (own > 0))] = -1
+        self._directions = directions.ravel().tolist()
+
+    def _flat(self, x: int, y: int) -> int:
+        return (y + 1) * self.stride + x + 1
+
+    def _flat_indices(self, mask: np.ndarray) -> typing.List[int]:
+        ys, xs = np.nonzero(mask)
+        return ((ys + 1) * self.stride + xs + 1).tolist()
+
+    def __repr__(self):
+        return f"{type(self).__name__}(width={self.width}, height={self.height}, goals={list(self.goals)})"
+
+
+class FlowFields:
+    """The flow fields of one level, keyed by goal set, movement profile
+    and cost limit; the least recently used are dropped past `size`"""
+
+    def __init__(self, level, size: int = 8):
+        self.level = level
+        self.size = size
+        self.fields: typing.Dict[typing.Hashable, FlowField] = OrderedDict()
+
+    def get(
+        self,
+        goals: typing.Iterable[Position],
+        profile: typing.Union[str, MovementProfile] = "walk",
+        max_cost: float = None,
+    ) -> FlowField:
+        """Field toward the nearest of `goals`, repaired first if the
+        level's passable cells changed since it was last used"""
+        if isinstance(profile, str):
+            profile = movement_profiles[profile]
+        goals = [Position(x, y) for x, y in goals]
+        key = (frozenset(goals), profile.name, max_cost)
+        passable = profile.passable(self.level)
+        field = self.fields.pop(key, None)
+        if field is None:
+            field = FlowField(passable, goals, profile.orthogonal, profile.diagonal, max_cost)
+        else:
+            field.update(passable)
+        self.fields[key] = field
+        while len(self.fields) > self.size:
+            self.fields.popitem(last=False)
+        return field
+
+    def clear(self):
+        self.fields.clear()
+
+    def __len__(self):
+        return len(self.fields)
@@ -1,12 +1,152 @@
+import typing
+
+import numpy as np
+
 from .maths import Position
 from .procgen import Level
-from .rendering import render_tile
+from .rendering import render_level
+from .tiles import TileFlag
 # from .utils.decorators import profile
 
+# Octant transforms: (xx, xy, yx, yy)
+octants = (
+    (1, 0, 0, 1),
+    (0, 1, 1, 0),
+    (0, -1, 1, 0),
+    (-1, 0, 0, 1),
+    (-1, 0, 0, -1),
+    (0, -1, -1, 0),
+    (0, 1, -1, 0),
+    (1, 0, 0, -1),
+)
+
+fov_engines = {}
+
+
+class FovEngine:
+    """Field of view calculation over a boolean transparency array
+
+    Subclasses set `name` to register themselves and implement
+    `compute`.  Arrays are indexed [y, x].
+    """
+
+    name: str = None
+
+    def __init_subclass__(cls, **kwds):
+        super().__init_subclass__(**kwds)
+        if cls.name:
+            fov_engines[cls.name] = cls
+
+    def compute(self, transparency: np.ndarray, origin: Position, radius: int = None) -> np.ndarray:
+        """Returns a boolean visibility mask the shape of transparency
+
+        Args:
+            transparency: True where light passes through a cell
+            origin: viewer position
+            radius: maximum view distance [default: unlimited]
+        """
+        raise NotImplementedError(".compute method must be implemented by subclass")
+
+    def __call__(self, transparency, origin, radius=None):
+        return self.compute(transparency, origin, radius=radius)
+
+    def __repr__(self):
+        return f"{type(self).__name__}()"
+
+
+class ShadowcastingFov(FovEngine):
+    """Recursive shadowcasting
+
+    Scans each octant row by row, tracking the slopes of the light
+    that is still unobstructed; only cells inside the lit wedge are
+    ever touched.  Open cells are visible when their center is lit,
+    walls when any part of them is lit.
+    """
+
+    name = "shadowcasting"
+
+    # open cells only need to be partially lit
+    permissive = False
+
+    def compute(self, transparency, origin, radius=None):
+        height, width = transparency.shape
+        ox, oy = origin
+        radius = max(width, height) if radius is None else radius
+        # flat byte buffers are much cheaper to index than ndarrays
+        clear = np.ascontiguousarray(transparency, dtype=np.bool_).tobytes()
+        visible = bytearray(width * height)
+        if 0 <= ox < width and 0 <= oy < height:
+            visible[oy * width + ox] = 1
+            for xx, xy, yx, yy in octants:
+                self._scan(clear, visible, width, height, ox, oy, radius, 1, 1.0, 0.0, xx, xy, yx, yy)
+        return np.frombuffer(bytes(visible), dtype=np.bool_).reshape(height, width)
+
+    def _scan(self, clear, visible, width, height, ox, oy, radius, row, start, end, xx, xy, yx, yy):
+        if start < end:
+            return
+        radius_squared = radius * radius
+        permissive = self.permissive
+        new_start = start
+        for j in range(row, radius + 1):
+            dy = -j
+            blocked = False
+            for dx in range(-j, 1):
+                l_slope = (dx - 0.5) / (dy + 0.5)
+                r_slope = (dx + 0.5) / (dy - 0.5)
+                if start < r_slope:
+                    continue
+                elif end > l_slope:
+                    break
+
+                x = ox + dx * xx + dy * xy
+                y = oy + dx * yx + dy * yy
+                inside = 0 <= x < width and 0 <= y < height
+                opaque = not inside or not clear[y * width + x]
+                if inside and dx * dx + dy * dy <= radius_squared:
+                    if permissive or opaque or end <= dx / dy <= start:
+                        visible[y * width + x] = 1
+
+                if blocked:
+                    if opaque:
+                        new_start = r_slope
+                    else:
+                        blocked = False
+                        start = new_start
+                elif opaque and j < radius:
+                    blocked = True
+                    self._scan(clear, visible, width, height, ox, oy, radius, j + 1, start, l_slope, xx, xy, yx, yy)
+                    new_start = r_slope
+            if blocked:
+                break
+
+
+class PermissiveFov(ShadowcastingFov):
+    """Permissive shadowcasting
+
+    Any cell touched by the lit wedge is visible, which reveals more
+    around corners and pillars than strict shadowcasting.
+    """
+
+    name = "permissive"
+
+    permissive = True
+
+
+def get_fov_engine(engine: typing.Union[str, FovEngine] = None) -> FovEngine:
+    if isinstance(engine, FovEngine):
+        return engine
+    engine_cls = fov_engines[engine or "shadowcasting"]
+    return engine_cls()
+
+
+def compute_fov(transparency: np.ndarray, origin: Position, radius: int = None, engine: typing.Union[str, FovEngine] = None) -> np.ndarray:
+    engine = get_fov_engine(engine)
+    return engine.compute(transparency, origin, radius=radius)
+
 
 # @profile
 def cast_view(position: Position, level: Level):
-    # TODO: This is damn slow.
+    # Legacy ray sweep; see compute_fov
     for edge in level.edges:
         for point in position.ray(edge, maxx=level.width, maxy=level.height, minx=0, miny=0):
             tile = level[point]
@@ -16,20 +156,18 @@ def cast_view(position: Position, level: Level):
                 break
 
 
-def handle_view(old: Position, new: Position, level: Level):
-    # Handle field of view
-    old_visible_positions = [p for p in cast_view(old, level)]
-    new_visible_positions = [p for p in cast_view(new, level)]
-    unviewable_positions = set(old_visible_positions) - set(new_visible_positions)
-    for newly_viewable_position in new_visible_positions:
-        tile = level[newly_viewable_position]
-        tile.explored = True
-        tile.visible = True if tile.lit else False
-        x, y = newly_viewable_position
-        render_tile(newly_viewable_position, tile)
-
-    for unviewable_position in unviewable_positions:
-        tile = level[unviewable_position]
-        tile.visible = False
-        render_tile(unviewable_position, tile)
-
+def handle_view(old: Position, new: Position, level: Level, engine: typing.Union[str, FovEngine] = None, source: str = "view"):
+    # Handle field of view; only cells that changed since the last
+    # frame are touched.
+    engine = get_fov_engine(engine)
+    transparency = level.transparency
+    lit = level.tiles.mask(TileFlag.LIT)
+    first_frame = source not in level.visibility
+    new_visible = engine.compute(transparency, new) & lit
+    changed = level.visibility.update(source, new_visible)
+    if first_frame and old != new:
+        # nothing cached yet: clear whatever was visible from `old`
+        changed |= engine.compute(transparency, old) & lit
+    level.update_flags(TileFlag.EXPLORED | TileFlag.VISIBLE, changed & new_visible)
+    level.update_flags(TileFlag.VISIBLE, changed & ~new_visible, False)
+    render_level(level, changed)
@@ -12,10 +12,11 @@ from .config import settings
 from .ecs import Entity
 from .fov import handle_view
 from .lighting import handle_lighting
-from .procgen import create_dungeon
+from .procgen import LazyDungeon
+from .procgen.cache import DungeonCache
 from kelte.items import populate_item_data
 from kelte.mobs import populate_mob_data
-from .rendering import render_entity, render_tile
+from .rendering import FrameBuffer, render_entity, render_level
 from .tiles import get_tile, populate_tile_data
 from .utils import terminal
 
@@ -35,7 +36,7 @@ def initialize(debug=None, verbose=None, seed=None):
     """Initializes game"""
     verbose = 1 if debug else max(int(verbose or 0), 0)  # cap minimum at 0
 
-    tdl.sys_set_fps(20)
+    tdl.sys_set_fps(settings.fps)
     initialize_random_seed(seed=seed, debug=debug, verbose=verbose)
     initialize_typeface(debug=debug, verbose=verbose)
     initialize_console(debug=debug, verbose=verbose)
@@ -57,7 +58,9 @@ def initialize_console(title=None, width=None, height=None, fullscreen=None, ren
     fullscreen = fullscreen or settings.full_screen
     renderer = renderer or settings.renderer
 
-    settings.main_console = tdl.console_init_root(screen_width, screen_height, title, fullscreen, renderer)
+    settings.root_console = tdl.console_init_root(screen_width, screen_height, title, fullscreen, renderer)
+    settings.frame = FrameBuffer(screen_width, screen_height, root=settings.root_console, fps=settings.fps)
+    settings.main_console = settings.frame.back
     tdl.console_set_default_foreground(settings.main_console, get_color('grey').tdl_color)
     tdl.console_set_default_background(settings.main_console, get_color('black').tdl_color)
 
@@ -92,23 +95,34 @@ def initialize_game_data(debug=None, verbose=None):
     player.tile.lit_color = get_color('yellow')
     player.tile.unlit_color = get_color('dark_yellow')
 
-    settings.entities = {}
-
     settings.player = player
     terminal.echo(f"Created player: {player}", verbose=verbose)
 
-    dungeon = create_dungeon(width=settings.map_width, height=settings.map_height)
+    # a baked pack is loaded as is; otherwise only the first level is built
+    # now and deeper ones build in the background
+    parameters = settings.seed, settings.map_width, settings.map_height, settings.dungeon_levels
+    dungeon = DungeonCache(settings.cache_path).get(*parameters) if settings.dungeon_cache else None
+    if dungeon is not None:
+        terminal.echo(f"Loaded dungeon from {dungeon.path}", verbose=verbose)
+    else:
+        dungeon = LazyDungeon(
+            settings.dungeon_levels,
+            width=settings.map_width,
+            height=settings.map_height,
+            seed=settings.seed,
+            processes=settings.dungeon_processes,
+        )
     settings.dungeon = dungeon
     settings.current_level = dungeon[0]
+    settings.entities = settings.current_level.entities
 
     random_starting_room = random.choice(settings.current_level.rooms)
     settings.player.add_component("position", random_starting_room.center)
 
-    settings.entities[player.position] = player
+    settings.entities.add(player)
 
-    for position, tile in settings.current_level:
-        # setup console
-        render_tile(position, tile)
+    # setup console
+    render_level(settings.current_level)
 
     for position, entity in settings.entities.items():
         if entity == settings.player:
@@ -1,8 +1,94 @@
+import typing
+
+import numpy as np
+
 from .colors import Color, get_color
-from .config import settings
-from .maths import Position
+from .fov import FovEngine, get_fov_engine
+from .maths import Position, PositionArray
 from .procgen import Level
-from .rendering import render_tile
+from .rendering import color_table, glyph_table, render_cells, render_char, render_level
+from .tiles import TileFlag
+from .tiles.grid import palette_array
+
+
+class LightSource:
+    """Point light with a precomputed radial falloff kernel
+
+    The kernel holds the light's intensity for every offset within its
+    radius, so lighting a region is a crop, a field of view mask and a
+    multiply.
+    """
+
+    def __init__(self, color: Color = None, intensity: int = None, threshold: int = None, engine: typing.Union[str, FovEngine] = None):
+        self.color = color if color is not None else get_color('grey')
+        self.intensity = intensity if intensity is not None else 2048
+        self.threshold = threshold if threshold is not None else 10
+        self.engine = get_fov_engine(engine)
+        self.gradient = intensity_gradient(self.intensity, self.threshold)
+        self.radius = len(self.gradient)
+        self.kernel = falloff_kernel(self.gradient, self.intensity)
+        # Color.tint only depends on the light; Color adds channels in
+        # (r, b, g) order
+        tint = self.color.tint(self.color)
+        self.tint = np.array((tint.r, tint.b, tint.g), dtype=np.float64)
+
+    def illuminate(self, position: Position, transparency: np.ndarray) -> typing.Tuple[int, int, np.ndarray]:
+        """Returns (x, y, intensities) for the patch of cells this light reaches"""
+        height, width = transparency.shape
+        x, y = position
+        r = self.radius
+        x0, x1 = max(0, x - r), min(width, x + r + 1)
+        y0, y1 = max(0, y - r), min(height, y + r + 1)
+        if x0 >= x1 or y0 >= y1:
+            return x0, y0, np.zeros((0, 0), dtype=np.float64)
+        visible = self.engine.compute(transparency[y0:y1, x0:x1], (x - x0, y - y0), radius=r)
+        kernel = self.kernel[y0 - y + r:y1 - y + r, x0 - x + r:x1 - x + r]
+        return x0, y0, np.where(visible, kernel, np.float64(0))
+
+    def __repr__(self):
+        return f"{type(self).__name__}(color={self.color!r}, intensity={self.intensity}, radius={self.radius})"
+
+
+def intensity_gradient(intensity: int, threshold: int) -> typing.List[int]:
+    gradient = []
+    for light_distance in range(1, 20):
+        denom = light_distance ** 2
+        current_intensity = min(512, intensity) // denom
+        if current_intensity < threshold:
+            break
+        gradient.append(current_intensity)
+    return gradient
+
+
+def falloff_kernel(gradient: typing.List[int], intensity: int) -> np.ndarray:
+    """Light intensity by (dy, dx) offset; steps fall off by chebyshev
+    distance and the light is clipped to a circle"""
+    radius = len(gradient)
+    scale = intensity / (len(gradient) * 2)
+    offsets = np.arange(-radius, radius + 1)
+    dy, dx = np.meshgrid(offsets, offsets, indexing='ij')
+    steps = np.maximum(abs(dx), abs(dy))
+    inside = (steps < radius) & (dx ** 2 + dy ** 2 <= radius ** 2)
+    values = np.array(gradient + [0], dtype=np.float64) / scale
+    return np.where(inside, values[np.minimum(steps, radius)], np.float64(0)).astype(np.float64)
+
+
+def shade(base: np.ndarray, intensity: np.ndarray, tint: np.ndarray) -> np.ndarray:
+    """Lit foreground as uint8 rgb: base * intensity + tint"""
+    color = np.minimum(base * intensity[..., None], 1.0)
+    color = np.clip(color + tint, 0.0, 1.0)
+    return (color * 255).astype(np.uint8)
+
+
+_light_sources = {}
+
+
+def get_light_source(color: Color = None) -> LightSource:
+    color = color if color is not None else get_color('grey')
+    light = _light_sources.get(color.hexa)
+    if light is None:
+        light = _light_sources[color.hexa] = LightSource(color=color)
+    return light
 
 
 def cast_light(position: Position, level: Level, intensity: int = None, color: Color = None, threshold: int = None):
@@ -26,7 +112,7 @@ def cast_light(position: Position, level: Level, intensity: int = None, color: C
             elif dx ** 2 + dy ** 2 > light_radius ** 2:
                 break
             tile = level[point]
-            entity = settings.entities.get(point)
+            entity = level.entities.get(point)
             if entity:
                 tile = entity.tile
             new_tint = tile.lit_color.tint(light_color)
@@ -35,62 +121,77 @@ def cast_light(position: Position, level: Level, intensity: int = None, color: C
                 break
 
 
-def get_edges_from_radius(position: Position, radius: int):
+def get_edges_from_radius(position: Position, radius: int) -> PositionArray:
     max_x = position.x + radius
     min_x = position.x - radius
     max_y = position.y + radius
     min_y = position.y - radius
-    for x in range(min_x, max_x + 1):
-        yield Position(x, min_y)
-        yield Position(x, max_y)
-    for y in range(min_y, max_y + 1):
-        yield Position(min_x, y)
-        yield Position(max_x, y)
+    xs = np.arange(min_x, max_x + 1)
+    ys = np.arange(min_y, max_y + 1)
+    top_bottom = np.stack([xs, np.full_like(xs, min_y), xs, np.full_like(xs, max_y)], axis=-1)
+    left_right = np.stack([np.full_like(ys, min_x), ys, np.full_like(ys, max_x), ys], axis=-1)
+    return PositionArray(np.concatenate([top_bottom.reshape(-1, 2), left_right.reshape(-1, 2)]))
+
+
+def handle_lighting(old: Position, new: Position, level: Level, color: Color = None, source: str = "player", light: LightSource = None):
+    # Moves `source` (adding it if needed) and re-renders only the cells
+    # whose accumulated light changed
+    lights = level.lights
+    first_frame = source not in lights
+    if first_frame:
+        lights.add(source, light or get_light_source(color), new)
+    else:
+        lights.move(source, new)
+
+    transparency = level.transparency
+    for position, entity in level.entities.items():
+        if entity.tile.opaque:
+            transparency[position.y, position.x] = False
 
+    changed = lights.update(transparency)
+    if first_frame and old != new:
+        # nothing cached yet: clear whatever `old` was lighting
+        x0, y0, patch = lights.lights[source]["light"].illuminate(old, transparency)
+        changed[y0:y0 + patch.shape[0], x0:x0 + patch.shape[1]] |= patch > 0
+    render_lighting(level, changed)
+
+
+def render_lighting(level: Level, changed: np.ndarray):
+    """Renders the cells in `changed` from the level's light buffer"""
+    intensities = level.lights.intensity
+    tints = level.lights.tint
 
-def handle_lighting(old: Position, new: Position, level: Level, color: Color = None):
     # Add new lighting
-    light_color = color or get_color('grey')
-    old_positions = {p: (c, i) for p, c, i in cast_light(old, level, color=light_color)}
-    new_positions = {p: (c, i) for p, c, i in cast_light(new, level, color=light_color)}
-    unlit_positions = set(old_positions.keys()) - set(new_positions.keys())
-    for newly_lit_position, (tint, intensity) in new_positions.items():
-        old_positions.pop(newly_lit_position, None)
-        tile = level[newly_lit_position]
+    lit = changed & (intensities > 0)
+    level.update_flags(TileFlag.EXPLORED, lit)
+    ys, xs = np.nonzero(lit)
+    ids = level.tiles.ids[ys, xs]
+    foreground = shade(palette_array('lit_color')[ids], intensities[ys, xs], tints[ys, xs])
+    background = color_table('background_lit_color')[ids]
+    modes = palette_array('background_mode')[ids]
+    render_cells(xs, ys, glyph_table()[ids], foreground, background, modes)
+
+    for position, entity in level.entities.select(lit):
+        tile = entity.tile
         tile.explored = True
-        entity = settings.entities.get(newly_lit_position)
-        if entity:
-            tile = entity.tile
-            tile.explored = True
-        tile_color = tile.lit_color * intensity + tint
-        background_tile_color = tile.background_lit_color
-        render_tile(newly_lit_position, tile, tile_color, background_tile_color)
+        base = np.array([tile.lit_color.r, tile.lit_color.g, tile.lit_color.b], dtype=np.float64)
+        fg = shade(base, intensities[position.y, position.x], tints[position.y, position.x])
+        bg = tile.background_lit_color
+        render_char(position.x, position.y, tile.character, fg.tolist(), (bg.red, bg.green, bg.blue), tile.background_mode)
 
     # Remove old lighting
-    for unlit_position in unlit_positions:
-        tile = level[unlit_position]
-        render_tile(unlit_position, tile)
+    render_level(level, changed & (intensities == 0))
 
 
 if __name__ == '__main__':
-    import random
     from .procgen import create_level
 
     level = create_level()
-    for position, tile in level:
-        tile.visible = True
-        tile.explored = True
-
-    position, tile = random.choice([
-        (position, tile)
-        for position, tile in level
-        if tile.transparent
-        ])
-    tile.character = '@'
-    tile.lit_color = get_color('yellow')
-
-    light_color = get_color('black')
-
-    cast_light(position, level, color=light_color)
+    position = level.rooms[0].center
+    light = LightSource(color=get_color('yellow'))
+    x0, y0, patch = light.illuminate(position, level.transparency)
+    mask = np.zeros((level.height, level.width), dtype=bool)
+    mask[y0:y0 + patch.shape[0], x0:x0 + patch.shape[1]] = patch > 0
+    level.update_flags(TileFlag.VISIBLE | TileFlag.EXPLORED | TileFlag.LIT, mask)
 
     print(level)
@@ -0,0 +1,135 @@
+import typing
+
+import numpy as np
+
+# Light accumulation
+#   Every light contributes an intensity patch (and its tint wherever it
+#   reaches) to a per-level buffer.  Static lights are baked into their
+#   own buffer and only rebaked when one of them changes or the
+#   transparency inside its reach does; when dynamic lights are added,
+#   moved or removed only the bounding boxes they covered are
+#   re-accumulated.
+
+Box = typing.Tuple[int, int, int, int]
+
+
+class LightMap:
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.intensity = np.zeros((height, width), dtype=np.float64)
+        self.tint = np.zeros((height, width, 3), dtype=np.float64)
+        self.static_intensity = np.zeros_like(self.intensity)
+        self.static_tint = np.zeros_like(self.tint)
+        self.lights: typing.Dict[typing.Hashable, dict] = {}
+        self._transparency = None
+        self._dirty: typing.Set[typing.Hashable] = set()
+        self._boxes: typing.List[Box] = []
+        self._rebake = False
+
+    def add(self, key: typing.Hashable, light, position, static: bool = False):
+        """Adds a light; anything with `.illuminate` and `.tint` will do"""
+        if key in self.lights:
+            self.remove(key)
+        self.lights[key] = {"light": light, "position": position, "static": static, "patch": None}
+        self._dirty.add(key)
+
+    def move(self, key: typing.Hashable, position):
+        entry = self.lights[key]
+        if entry["static"]:
+            raise ValueError(f"Static light, {key!r}, cannot be moved")
+        if entry["position"] != position:
+            entry["position"] = position
+            self._dirty.add(key)
+
+    def remove(self, key: typing.Hashable):
+        entry = self.lights.pop(key)
+        self._dirty.discard(key)
+        if entry["patch"] is not None:
+            self._boxes.append(_box(entry["patch"]))
+            if entry["static"]:
+                self._rebake = True
+
+    def update(self, transparency: np.ndarray) -> np.ndarray:
+        """Re-accumulates whatever changed since the last update and
+        returns a boolean mask of cells whose light changed"""
+        changed = np.zeros((self.height, self.width), dtype=bool)
+        if self._transparency is not None:
+            blocked = transparency != self._transparency
+            if blocked.any():
+                # something moved in front of (or out of) a light; static
+                # ones are recomputed too and trigger a rebake
+                for key, entry in self.lights.items():
+                    if entry["patch"] is not None:
+                        x0, y0, x1, y1 = _box(entry["patch"])
+                        if blocked[y0:y1, x0:x1].any():
+                            self._dirty.add(key)
+        self._transparency = transparency.copy()
+
+        boxes = self._boxes
+        for key in self._dirty:
+            entry = self.lights[key]
+            if entry["patch"] is not None:
+                boxes.append(_box(entry["patch"]))
+            entry["patch"] = entry["light"].illuminate(entry["position"], transparency)
+            boxes.append(_box(entry["patch"]))
+            if entry["static"]:
+                self._rebake = True
+        self._dirty = set()
+        self._boxes = []
+
+        if self._rebake:
+            self.bake()
+        for box in boxes:
+            self._accumulate(box, changed)
+        return changed
+
+    def bake(self):
+        """Rebuilds the static light buffer"""
+        self.static_intensity[...] = 0
+        self.static_tint[...] = 0
+        for entry in self.lights.values():
+            if entry["static"] and entry["patch"] is not None:
+                _add(self.static_intensity, self.static_tint, entry["light"], entry["patch"], (0, 0, self.width, self.height))
+        self._rebake = False
+
+    def _accumulate(self, box: Box, changed: np.ndarray):
+        x0, y0, x1, y1 = box
+        if x0 >= x1 or y0 >= y1:
+            return
+        intensity = self.static_intensity[y0:y1, x0:x1].copy()
+        tint = self.static_tint[y0:y1, x0:x1].copy()
+        for entry in self.lights.values():
+            if not entry["static"] and entry["patch"] is not None:
+                _add(intensity, tint, entry["light"], entry["patch"], box)
+        changed[y0:y1, x0:x1] |= intensity != self.intensity[y0:y1, x0:x1]
+        changed[y0:y1, x0:x1] |= (tint != self.tint[y0:y1, x0:x1]).any(axis=-1)
+        self.intensity[y0:y1, x0:x1] = intensity
+        self.tint[y0:y1, x0:x1] = tint
+
+    def __contains__(self, key):
+        return key in self.lights
+
+    def __len__(self):
+        return len(self.lights)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(width={self.width}, height={self.height}, lights={len(self.lights)})"
+
+
+def _box(patch) -> Box:
+    x0, y0, values = patch
+    return x0, y0, x0 + values.shape[1], y0 + values.shape[0]
+
+
+def _add(intensity: np.ndarray, tint: np.ndarray, light, patch, box: Box):
+    # adds the overlap of `patch` with `box` into buffers covering `box`
+    bx0, by0, bx1, by1 = box
+    px0, py0, px1, py1 = _box(patch)
+    x0, y0 = max(bx0, px0), max(by0, py0)
+    x1, y1 = min(bx1, px1), min(by1, py1)
+    if x0 >= x1 or y0 >= y1:
+        return
+    values = patch[2][y0 - py0:y1 - py0, x0 - px0:x1 - px0]
+    intensity[y0 - by0:y1 - by0, x0 - bx0:x1 - bx0] += values
+    tint[y0 - by0:y1 - by0, x0 - bx0:x1 - bx0] += (values > 0)[..., None] * light.tint
@@ -1,6 +1,34 @@
-from . import distance, grids, noise, point, vector
-from .bresenham import bresenham
+import importlib
+
+from . import distance, grids, point, vector
+from .bresenham import bresenham, ray_offsets, rays
 from .grids import create_grid
-from .noise import perlin
 from .point import Point, Position
+from .positions import PositionArray
 from .vector import Direction
+
+# Lazy exports
+#   Position and what it is built on load with the package; graphs,
+#   noise and pathing are only imported the first time something reaches
+#   for them here (PEP 562), so importing the game doesn't pay for them.
+
+_lazy_modules = ("graphs", "noise", "pathing")
+_lazy_attributes = {
+    "CSRGraph": "graphs",
+    "Noise": "noise",
+    "perlin": "noise",
+}
+
+
+def __getattr__(name):
+    if name in _lazy_modules:
+        return importlib.import_module(f"{__name__}.{name}")
+    if name in _lazy_attributes:
+        value = getattr(importlib.import_module(f"{__name__}.{_lazy_attributes[name]}"), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_modules) | set(_lazy_attributes))
@@ -1,3 +1,9 @@
+import functools
+import typing
+
+import numpy as np
+
+
 def bresenham(start, end):
     """Yield a line ray from start to end
     """
@@ -24,6 +30,50 @@ def bresenham(start, end):
         error = error + 2 * dy
 
 
+@functools.lru_cache(maxsize=65536)
+def ray_offsets(dx: int, dy: int) -> np.ndarray:
+    """Cached (n, 2) int16 offsets of the line from (0, 0) to (dx, dy)
+
+    The arrays are shared between callers and read-only.
+    """
+    offsets = np.array(list(bresenham((0, 0), (dx, dy))), dtype=np.int16).reshape(-1, 2)
+    offsets.setflags(write=False)
+    return offsets
+
+
+def rays(origin, targets) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """All lines from `origin` to each of `targets` at once
+
+    Returns (points, lengths): points is an (n, longest, 2) int32 array
+    of x, y pairs, with each ray padded out by repeating its last point,
+    and lengths holds the number of real points in each ray.
+    """
+    ox, oy = origin
+    deltas = np.asarray(targets, dtype=np.int64).reshape(-1, 2) - (ox, oy)
+    offsets = [ray_offsets(dx, dy) for dx, dy in deltas.tolist()]
+    lengths = np.array([len(ray) for ray in offsets], dtype=np.int32)
+    longest = int(lengths.max()) if len(lengths) else 0
+    points = np.empty((len(offsets), longest, 2), dtype=np.int32)
+    for index, ray in enumerate(offsets):
+        length = len(ray)
+        points[index, :length] = ray
+        points[index, length:] = ray[-1]
+    points += (ox, oy)
+    return points, lengths
+
+
+def ray_mask(points: np.ndarray, lengths: np.ndarray, width: int = None, height: int = None, minx: int = 0, miny: int = 0) -> np.ndarray:
+    """(n, longest) boolean mask of the real ray points that fall within
+    minx <= x < width and miny <= y < height"""
+    mask = np.arange(points.shape[1]) < lengths[:, None]
+    xs, ys = points[..., 0], points[..., 1]
+    if width is not None:
+        mask &= (minx <= xs) & (xs < width)
+    if height is not None:
+        mask &= (miny <= ys) & (ys < height)
+    return mask
+
+
 if __name__ == '__main__':
     import random
     from kelte.vendored import click
@@ -1,5 +1,15 @@
+import math
+import typing
+
 import numpy as np
-import scipy.spatial.distance as spsd
+
+# Distance metrics
+#   The *_distance functions measure a single pair of tuples in plain
+#   Python.  The kernels take coordinate arrays and broadcast over the
+#   leading axes: one point against many is (d,) vs (N, d), and
+#   `pairwise` gives the full (N, M) table.
+
+SQRT2 = math.sqrt(2)
 
 
 def euclidean_distance(point01, point02, strict=None):
@@ -12,7 +22,68 @@ def euclidean_distance(point01, point02, strict=None):
     Returns:
         float: distance value
     """
-    point01 = np.array(point01)
-    point02 = np.array(point02)
-    value = spsd.euclidean(point01, point02)
-    return value
+    return math.sqrt(sum((a - b) * (a - b) for a, b in zip(point01, point02)))
+
+
+def chebyshev_distance(point01, point02):
+    """Largest difference along any axis (king moves)"""
+    return max(abs(a - b) for a, b in zip(point01, point02))
+
+
+def manhattan_distance(point01, point02):
+    """Sum of the differences along every axis"""
+    return sum(abs(a - b) for a, b in zip(point01, point02))
+
+
+def octile_distance(point01, point02):
+    """8-way movement distance where a diagonal step costs sqrt(2)"""
+    dx, dy = abs(point01[0] - point02[0]), abs(point01[1] - point02[1])
+    return max(dx, dy) + (SQRT2 - 1) * min(dx, dy)
+
+
+def euclidean(points01, points02) -> np.ndarray:
+    delta = _delta(points01, points02)
+    return np.sqrt((delta * delta).sum(axis=-1))
+
+
+def chebyshev(points01, points02) -> np.ndarray:
+    return np.abs(_delta(points01, points02)).max(axis=-1)
+
+
+def manhattan(points01, points02) -> np.ndarray:
+    return np.abs(_delta(points01, points02)).sum(axis=-1)
+
+
+def octile(points01, points02) -> np.ndarray:
+    delta = np.abs(_delta(points01, points02))
+    dx, dy = delta[..., 0], delta[..., 1]
+    return np.maximum(dx, dy) + (SQRT2 - 1) * np.minimum(dx, dy)
+
+
+metrics: typing.Dict[str, typing.Callable[[typing.Any, typing.Any], np.ndarray]] = {
+    "euclidean": euclidean,
+    "chebyshev": chebyshev,
+    "manhattan": manhattan,
+    "octile": octile,
+}
+
+
+def pairwise(points01, points02, metric: str = "euclidean") -> np.ndarray:
+    """(N, M) distances between every point of two batches"""
+    points01 = np.asarray(points01)
+    points02 = np.asarray(points02)
+    return metrics[metric](points01[:, np.newaxis], points02[np.newaxis])
+
+
+def within(points, center, radius: float, metric: str = "euclidean") -> np.ndarray:
+    """Indices of the points at most `radius` away from `center`"""
+    if metric == "euclidean":
+        delta = _delta(points, center)
+        inside = (delta * delta).sum(axis=-1) <= radius * radius
+    else:
+        inside = metrics[metric](points, center) <= radius
+    return np.flatnonzero(inside)
+
+
+def _delta(points01, points02) -> np.ndarray:
+    return np.subtract(np.asarray(points01), np.asarray(points02))
@@ -1,6 +1,12 @@
+import math
 import typing
 from dataclasses import dataclass, field
 
+import numpy as np
+
+from .pathing import steps
+from .positions import PositionArray
+
 
 class Node:
     ...
@@ -59,7 +65,7 @@ class Node:
             edge = UndirectedEdge(self, other, data)
         else:
             edge = DirectedEdge(self, other, data)
-        self.edges.append(edge)
+        return edge  # the edge adds itself to its nodes
 
     def disconnect(self, other, data, directed=None):
         matched_edges = []
@@ -73,12 +79,20 @@ class Node:
                 self.edges.pop(index)
 
     def neighbors_in_range(self, range: int = 1):
-        if range:
-            for edge in self.edges:
-                if edge.start == self:
-                    yield from edge.end.neighbors_in_range(range=range - 1)
-                elif edge.end == self:
-                    yield from edge.start.neighbors_in_range(range=range - 1)
+        """Every other node at most `range` edges away, nearest first"""
+        visited = {id(self)}
+        frontier = [self]
+        depth = 0
+        while frontier and depth < range:
+            depth += 1
+            next_frontier = []
+            for node in frontier:
+                for neighbor in node.neighbors:
+                    if id(neighbor) not in visited:
+                        visited.add(id(neighbor))
+                        next_frontier.append(neighbor)
+                        yield neighbor
+            frontier = next_frontier
 
     def __hash__(self):
         return hash(tuple(self.identifier))
@@ -90,3 +104,167 @@ class Graph:
 
     def __contains__(self, other):
         return other.identifier in self.nodes
+
+
+# Compressed sparse row graphs
+#   Nodes are ints 0..n-1.  The neighbors of node i are
+#   targets[offsets[i]:offsets[i + 1]] (with matching weights), so a
+#   graph of thousands of nodes is three flat arrays and traversals
+#   expand a whole frontier at once.
+
+
+class CSRGraph:
+    def __init__(self, offsets: np.ndarray, targets: np.ndarray, weights: np.ndarray = None, labels: typing.Sequence = None):
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.targets = np.asarray(targets, dtype=np.int64)
+        self.weights = np.ones(len(self.targets)) if weights is None else np.asarray(weights, dtype=np.float64)
+        self.labels = labels  # optional data for each node (positions, rooms, ...)
+
+    @classmethod
+    def from_edges(
+        cls,
+        count: int,
+        sources: typing.Sequence[int],
+        targets: typing.Sequence[int],
+        weights: typing.Sequence[float] = None,
+        directed: bool = False,
+        labels: typing.Sequence = None,
+    ) -> "CSRGraph":
+        """Builds a graph of `count` nodes from parallel edge arrays;
+        undirected edges are stored in both directions"""
+        sources = np.asarray(sources, dtype=np.int64).ravel()
+        targets = np.asarray(targets, dtype=np.int64).ravel()
+        weights = np.ones(len(sources)) if weights is None else np.asarray(weights, dtype=np.float64).ravel()
+        if not directed:
+            sources, targets = np.concatenate([sources, targets]), np.concatenate([targets, sources])
+            weights = np.concatenate([weights, weights])
+        order = np.argsort(sources, kind="stable")
+        offsets = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=count), out=offsets[1:])
+        return cls(offsets, targets[order], weights[order], labels)
+
+    @classmethod
+    def from_grid(cls, walkable: np.ndarray, diagonal: bool = True) -> "CSRGraph":
+        """One node per walkable cell (row-major), linked to its walkable
+        neighbors; labels are the cells' positions"""
+        height, width = walkable.shape
+        ys, xs = np.nonzero(walkable)
+        ids = np.full((height, width), -1, dtype=np.int64)
+        ids[ys, xs] = np.arange(len(xs))
+        sources, targets, weights = [], [], []
+        for (dx, dy), cost in steps:
+            if cost != 1.0 and not diagonal:
+                continue
+            start = ids[max(0, -dy):height - max(0, dy), max(0, -dx):width - max(0, dx)]
+            end = ids[max(0, dy):height - max(0, -dy), max(0, dx):width - max(0, -dx)]
+            linked = (start >= 0) & (end >= 0)
+            sources.append(start[linked])
+            targets.append(end[linked])
+            weights.append(np.full(linked.sum(), cost))
+        labels = PositionArray(np.stack([xs, ys], axis=-1))
+        return cls.from_edges(
+            len(xs), np.concatenate(sources), np.concatenate(targets), np.concatenate(weights), directed=True, labels=labels
+        )
+
+    @classmethod
+    def from_rooms(cls, rooms: typing.Sequence, cooridors: typing.Iterable) -> "CSRGraph":
+        """One node per room, linked by the cooridors between them and
+        weighted by the distance between room centers"""
+        index = {id(room): node for node, room in enumerate(rooms)}
+        sources, targets, weights = [], [], []
+        for cooridor in cooridors:
+            start, end = cooridor.start_room, cooridor.end_room
+            if start is end:
+                continue
+            sources.append(index[id(start)])
+            targets.append(index[id(end)])
+            (x0, y0), (x1, y1) = start.center, end.center
+            weights.append(math.hypot(x1 - x0, y1 - y0))
+        return cls.from_edges(len(rooms), sources, targets, weights, labels=list(rooms))
+
+    @property
+    def node_count(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def edge_count(self) -> int:
+        """Stored (directed) edges; an undirected edge counts twice"""
+        return len(self.targets)
+
+    @property
+    def degrees(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def node(self, label) -> int:
+        """Node id of a label (e.g. a position or a room)"""
+        if not hasattr(self, "_nodes"):
+            self._nodes = {_key(value): node for node, value in enumerate(self.labels)}
+        return self._nodes[_key(label)]
+
+    def neighbors(self, node: int) -> np.ndarray:
+        return self.targets[self.offsets[node]:self.offsets[node + 1]]
+
+    def edge_weights(self, node: int) -> np.ndarray:
+        return self.weights[self.offsets[node]:self.offsets[node + 1]]
+
+    def bfs(self, start: typing.Union[int, typing.Iterable[int]], max_depth: int = None) -> np.ndarray:
+        """Number of edges from the nearest start node to every node; -1
+        where unreachable (or beyond `max_depth`)"""
+        depths = np.full(self.node_count, -1, dtype=np.int32)
+        visited = np.zeros(self.node_count, dtype=bool)
+        frontier = np.unique(np.asarray(start, dtype=np.int64).ravel())
+        visited[frontier] = True
+        depths[frontier] = 0
+        depth = 0
+        while len(frontier) and (max_depth is None or depth < max_depth):
+            depth += 1
+            reached = np.unique(self._expand(frontier))
+            frontier = reached[~visited[reached]]
+            visited[frontier] = True
+            depths[frontier] = depth
+        return depths
+
+    def in_range(self, start: int, depth: int = 1) -> np.ndarray:
+        """Nodes 1..depth edges away from `start`, nearest first"""
+        depths = self.bfs(start, depth)
+        found = np.flatnonzero(depths > 0)
+        return found[np.argsort(depths[found], kind="stable")]
+
+    def connected_components(self) -> typing.Tuple[int, np.ndarray]:
+        """Number of components and the component of every node (edges
+        are followed as stored, so use an undirected graph)"""
+        components = np.full(self.node_count, -1, dtype=np.int32)
+        count = 0
+        for node in range(self.node_count):
+            if components.item(node) >= 0:
+                continue
+            frontier = np.array([node], dtype=np.int64)
+            components[frontier] = count
+            while len(frontier):
+                reached = np.unique(self._expand(frontier))
+                frontier = reached[components[reached] < 0]
+                components[frontier] = count
+            count += 1
+        return count, components
+
+    def _expand(self, nodes: np.ndarray) -> np.ndarray:
+        # every target of every node in `nodes`, gathered without a loop
+        starts = self.offsets[nodes]
+        counts = self.offsets[nodes + 1] - starts
+        total = int(counts.sum())
+        skipped = np.cumsum(counts) - counts
+        return self.targets[np.repeat(starts - skipped, counts) + np.arange(total)]
+
+    def __len__(self):
+        return self.node_count
+
+    def __repr__(self):
+        return f"{type(self).__name__}(nodes={self.node_count}, edges={self.edge_count})"
+
+
+def _key(label):
+    try:
+        hash(label)
+    except TypeError:
+        return id(label)  # e.g. rooms, which compare by value
+    return label
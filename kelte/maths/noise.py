@@ -1,47 +1,127 @@
 import random
+import typing
 
 import numpy as np
 
+# Gradient noise
+#   A Noise owns its random generator and permutation table, so it never
+#   touches the global np.random state and the same seed always yields
+#   the same field.  Windows are sampled from integer cell coordinates,
+#   so neighboring chunks line up exactly with one big window and a large
+#   map can be generated piece by piece.
+
+# gradient vectors picked by hash % 4: up, down, right, left
+gradient_x = np.array([0, 0, 1, -1], dtype=np.int8)
+gradient_y = np.array([1, -1, 0, 0], dtype=np.int8)
+
+
+class Noise:
+    def __init__(
+        self,
+        seed: int = None,
+        scale: float = 0.1,
+        octaves: int = 1,
+        persistence: float = 0.5,
+        lacunarity: int = 2,
+        period: int = None,
+        size: int = 256,
+        permutation: typing.Sequence[int] = None,
+        block: int = 256,
+    ):
+        """
+        Args:
+            seed: seeds this noise's own np.random.Generator
+            scale: lattice cells per map cell for the first octave
+            octaves: layers of noise summed together
+            persistence: amplitude multiplier for each further octave
+            lacunarity: frequency multiplier for each further octave
+            period: when set, the field repeats every `period` lattice
+                cells (period / scale map cells) so it tiles seamlessly
+            size: length of the permutation table
+            permutation: explicit table (overrides seed and size)
+            block: rows evaluated at a time, bounding temporary memory
+        """
+        self.generator = np.random.default_rng(seed)
+        if permutation is None:
+            permutation = self.generator.permutation(size)
+        permutation = np.asarray(permutation, dtype=np.int64)
+        self.size = len(permutation)
+        self.permutation = np.concatenate([permutation, permutation])
+        self.scale = scale
+        self.octaves = octaves
+        self.persistence = persistence
+        self.lacunarity = lacunarity
+        self.period = period
+        self.block = block
+
+    def window(self, x: int, y: int, width: int, height: int, out: np.ndarray = None, dtype=np.float32) -> np.ndarray:
+        """[y, x] noise for the cells x..x + width and y..y + height"""
+        xs = np.arange(x, x + width) * self.scale
+        ys = np.arange(y, y + height) * self.scale
+        return self.grid(xs, ys, out=out, dtype=dtype)
+
+    def grid(self, xs: np.ndarray, ys: np.ndarray, out: np.ndarray = None, dtype=np.float32) -> np.ndarray:
+        """[y, x] noise at every (xs[j], ys[i]) in lattice coordinates,
+        roughly in [-1, 1]"""
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        if out is None:
+            out = np.empty((len(ys), len(xs)), dtype=dtype)
+        elif out.shape != (len(ys), len(xs)):
+            raise ValueError(f"out has shape {out.shape}, expected {(len(ys), len(xs))}")
+        for start in range(0, len(ys), self.block):
+            self._fractal(xs, ys[start:start + self.block], out[start:start + self.block])
+        return out
+
+    def _fractal(self, xs: np.ndarray, ys: np.ndarray, out: np.ndarray):
+        if self.octaves == 1:
+            out[...] = self._octave(xs, ys, self.period, out.dtype)
+            return
+        out[...] = 0
+        amplitude, frequency, total = 1.0, 1, 0.0
+        for _ in range(self.octaves):
+            period = None if self.period is None else self.period * frequency
+            out += amplitude * self._octave(xs * frequency, ys * frequency, period, out.dtype)
+            total += amplitude
+            amplitude *= self.persistence
+            frequency *= self.lacunarity
+        out /= total
+
+    def _octave(self, xs: np.ndarray, ys: np.ndarray, period: int = None, dtype=np.float64) -> np.ndarray:
+        # the window is a grid, so the per-axis work is done once per
+        # column and once per row and only the corners are broadcast
+        x0, xf, u = _axis(xs)
+        y0, yf, v = _axis(ys)
+        x1, y1 = x0 + 1, y0 + 1
+        if period is not None:
+            x0, x1, y0, y1 = x0 % period, x1 % period, y0 % period, y1 % period
+        x0, x1, y0, y1 = x0 % self.size, x1 % self.size, y0 % self.size, y1 % self.size
+        xf, u = xf.astype(dtype)[np.newaxis], u.astype(dtype)[np.newaxis]
+        yf, v = yf.astype(dtype)[:, np.newaxis], v.astype(dtype)[:, np.newaxis]
+        p = self.permutation
+        px0, px1 = p[x0][np.newaxis], p[x1][np.newaxis]
+        y0, y1 = y0[:, np.newaxis], y1[:, np.newaxis]
+
+        n00 = _gradient(p[px0 + y0], xf, yf)
+        n01 = _gradient(p[px0 + y1], xf, yf - 1)
+        n11 = _gradient(p[px1 + y1], xf - 1, yf - 1)
+        n10 = _gradient(p[px1 + y0], xf - 1, yf)
+        return lerp(lerp(n00, n10, u), lerp(n01, n11, u), v)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(scale={self.scale}, octaves={self.octaves}, period={self.period})"
+
 
 def perlin(samples=None, seed=None, size=None):
-    # permutation table
+    """`samples` x `samples` noise over [0, 5), flipped vertically"""
     size = 256 if size is None else size
     samples = 100 if samples is None else samples
     seed = random.randint(0, size) if seed is None else seed
-    np.random.seed(seed)
+    # same table as seeding the legacy global generator, without doing so
+    permutation = np.arange(size, dtype=int)
+    np.random.RandomState(seed).shuffle(permutation)
     lin = np.linspace(0, 5, samples, endpoint=False)
-    x, y = np.meshgrid(lin, lin[::-1])
-
-    # grab 256 random values
-    p = np.arange(size, dtype=int)
-    np.random.shuffle(p)
-
-    p = np.stack([p, p]).flatten()
-
-    # coordinates of the top-left
-    xi = x.astype(int)
-    yi = y.astype(int)
-
-    # internal coordinates
-    xf = x - xi
-    yf = y - yi
-
-    # fade factors
-    u = fade(xf)
-    v = fade(yf)
-
-    # noise components
-    n00 = gradient(p[p[xi] + yi], xf, yf)
-    n01 = gradient(p[p[xi] + yi + 1], xf, yf - 1)
-    n11 = gradient(p[p[xi + 1] + yi + 1], xf - 1, yf - 1)
-    n10 = gradient(p[p[xi + 1] + yi], xf - 1, yf)
-
-    # linear interpolation of noises
-    x1 = lerp(n00, n10, u)
-    x2 = lerp(n01, n11, u)
-
-    final = lerp(x1, x2, v)
-    return final
+    return Noise(permutation=permutation).grid(lin, lin[::-1], dtype=np.float64)
 
 
 def lerp(a, b, x):
@@ -58,3 +138,15 @@ def gradient(h, x, y):
     vectors = np.array([[0, 1], [0, -1], [1, 0], [-1, 0]])
     g = vectors[h % 4]
     return g[:, :, 0] * x + g[:, :, 1] * y
+
+
+def _axis(coordinates: np.ndarray) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # lattice cell, offset inside it and its fade factor
+    cells = np.floor(coordinates)
+    offsets = coordinates - cells
+    return cells.astype(np.int64), offsets, fade(offsets)
+
+
+def _gradient(h: np.ndarray, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    h = h & 3
+    return gradient_x[h] * x + gradient_y[h] * y
@@ -1,10 +1,184 @@
-from .graph import Graph
+import heapq
+import math
+import typing
+
+import numpy as np
+
+from . import vector
 from .point import Position
 
+# Grid pathfinding
+#   Works directly on a level's [y, x] walkability array.  The grid is
+#   padded with a blocked border and flattened, so a step is an index
+#   offset and never needs a bounds check.
+
+SQRT2 = math.sqrt(2)
+
+# (direction, cost) for the eight vector directions
+steps = (
+    (vector.UP, 1.0),
+    (vector.DOWN, 1.0),
+    (vector.LEFT, 1.0),
+    (vector.RIGHT, 1.0),
+    (vector.UP_LEFT, SQRT2),
+    (vector.UP_RIGHT, SQRT2),
+    (vector.DOWN_LEFT, SQRT2),
+    (vector.DOWN_RIGHT, SQRT2),
+)
+
+
+def octile(start: Position, end: Position) -> float:
+    """Distance with 8-way movement where diagonals cost sqrt(2)"""
+    dx, dy = abs(start[0] - end[0]), abs(start[1] - end[1])
+    return max(dx, dy) + (SQRT2 - 1) * min(dx, dy)
+
+
+def a_star(walkable: np.ndarray, start: Position, end: Position) -> typing.List[Position]:
+    """Returns a position for every step in the path between start and
+    end (excluding start); empty when end can't be reached"""
+    height, width = walkable.shape
+    sx, sy = start
+    ex, ey = end
+    if not (0 <= ex < width and 0 <= ey < height and walkable[ey, ex]):
+        return []
+    if (sx, sy) == (ex, ey):
+        return []
+
+    stride = width + 2
+    open_cells = padded(walkable).ravel().tolist()
+    offsets = step_offsets(stride)
+    origin = (sy + 1) * stride + sx + 1
+    goal = (ey + 1) * stride + ex + 1
+    # octile estimate: dx + dy + (sqrt(2) - 2) * min(dx, dy)
+    diagonal = SQRT2 - 2
+
+    costs = {origin: 0.0}
+    came_from = {origin: origin}
+    closed = set()
+    heap = [(octile(start, end), 0, origin)]
+    counter = 0
+    while heap:
+        _, _, current = heapq.heappop(heap)
+        if current == goal:
+            break
+        if current in closed:
+            continue
+        closed.add(current)
+        cost = costs[current]
+        for offset, step_cost in offsets:
+            neighbor = current + offset
+            if not open_cells[neighbor] or neighbor in closed:
+                continue
+            new_cost = cost + step_cost
+            if new_cost < costs.get(neighbor, math.inf):
+                costs[neighbor] = new_cost
+                came_from[neighbor] = current
+                ny, nx = divmod(neighbor, stride)
+                dx, dy = abs(nx - 1 - ex), abs(ny - 1 - ey)
+                estimate = dx + dy + diagonal * min(dx, dy)
+                counter += 1
+                heapq.heappush(heap, (new_cost + estimate, counter, neighbor))
+    else:
+        return []
+
+    path = []
+    current = goal
+    while current != origin:
+        y, x = divmod(current, stride)
+        path.append(Position(x - 1, y - 1))
+        current = came_from[current]
+    path.reverse()
+    return path
+
+
+def dijkstra_map(walkable: np.ndarray, sources: typing.Iterable[Position], max_cost: float = None) -> np.ndarray:
+    """Cost of the cheapest path from any source to every cell
+
+    Unreachable cells (and cells beyond `max_cost`) are inf.  Every mob
+    heading for the same goal can share one map and `descend` it.
+    """
+    height, width = walkable.shape
+    stride = width + 2
+    open_cells = padded(walkable).ravel().tolist()
+    costs = [math.inf] * len(open_cells)
+    heap = []
+    for x, y in sources:
+        index = (y + 1) * stride + x + 1
+        if open_cells[index]:
+            costs[index] = 0.0
+            heap.append((0.0, index))
+    relax(costs, open_cells, heap, step_offsets(stride), max_cost)
+    return np.array(costs).reshape(height + 2, stride)[1:-1, 1:-1]
+
+
+def step_offsets(stride: int, orthogonal: float = 1.0, diagonal: float = SQRT2) -> typing.List[typing.Tuple[int, float]]:
+    """(flat index offset, cost) of each step on a padded grid"""
+    return [
+        (dy * stride + dx, orthogonal if cost == 1.0 else diagonal)
+        for (dx, dy), cost in steps
+    ]
+
+
+def relax(costs: list, open_cells: list, heap: list, offsets: list, max_cost: float = None):
+    """Dijkstra over flat padded cells, starting from the (cost, index)
+    entries in `heap`; lowers `costs` in place"""
+    max_cost = math.inf if max_cost is None else max_cost
+    heapq.heapify(heap)
+    push, pop = heapq.heappush, heapq.heappop
+    while heap:
+        cost, current = pop(heap)
+        if cost > costs[current]:
+            continue
+        for offset, step_cost in offsets:
+            neighbor = current + offset
+            new_cost = cost + step_cost
+            if new_cost < costs[neighbor] and open_cells[neighbor] and new_cost <= max_cost:
+                costs[neighbor] = new_cost
+                push(heap, (new_cost, neighbor))
+
+
+def descend(cost_map: np.ndarray, position: Position) -> Position:
+    """Next step downhill on a cost map (the position itself when no
+    neighbor is cheaper)"""
+    position = Position(*position)
+    height, width = cost_map.shape
+    best, best_cost = position, cost_map[position[1], position[0]]
+    for direction, _ in steps:
+        x, y = position + direction
+        if 0 <= x < width and 0 <= y < height and cost_map[y, x] < best_cost:
+            best, best_cost = Position(x, y), cost_map[y, x]
+    return best
+
+
+def breadth_first(walkable: np.ndarray, start: Position, max_distance: int = None) -> np.ndarray:
+    """Number of 8-way steps from start to every cell; -1 if unreachable
 
-def a_star(start: Position) -> Position:
-    """Yields a position for every step in the path between start and
-    end"""
+    Expands the whole frontier at once with array shifts.
+    """
+    height, width = walkable.shape
+    distances = np.full((height, width), -1, dtype=np.int32)
+    x, y = start
+    if not walkable[y, x]:
+        return distances
+    distances[y, x] = 0
+    frontier = np.zeros((height + 2, width + 2), dtype=bool)
+    frontier[y + 1, x + 1] = True
+    unvisited = padded(walkable)
+    unvisited[y + 1, x + 1] = False
+    distance = 0
+    while frontier.any() and (max_distance is None or distance < max_distance):
+        distance += 1
+        grown = np.zeros_like(frontier)
+        for (dx, dy), _ in steps:
+            grown[1:-1, 1:-1] |= frontier[1 + dy:height + 1 + dy, 1 + dx:width + 1 + dx]
+        frontier = grown & unvisited
+        unvisited &= ~frontier
+        distances[frontier[1:-1, 1:-1]] = distance
+    return distances
 
 
-def breadth_first(grid: Graph, start: Position)
+def padded(walkable: np.ndarray) -> np.ndarray:
+    """Copy of `walkable` with a blocked one cell border"""
+    padded = np.zeros((walkable.shape[0] + 2, walkable.shape[1] + 2), dtype=bool)
+    padded[1:-1, 1:-1] = walkable
+    return padded
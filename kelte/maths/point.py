@@ -1,8 +1,8 @@
-from dataclasses import dataclass
+from operator import itemgetter
 
 import numpy as np
 
-from .bresenham import bresenham
+from .bresenham import bresenham, ray_offsets
 from .distance import euclidean_distance
 from .grids import create_grid
 
@@ -106,35 +106,125 @@ class Point:
         return cls(*tuple(np.subtract(tuple(self), other)))
 
 
-@dataclass
-class Position(Point):
-    x: int = 0
-    y: int = 0
+# builds a coordinate from ints without going through __new__
+_new = tuple.__new__
 
-    def __hash__(self):
-        return hash((self.x, self.y))
 
-    def __getitem__(self, item):
-        data = tuple(self)
-        if isinstance(item, int):
-            return data[item]
-        elif isinstance(item, str):
-            return self.__dict__[item]
+class Coordinate(tuple):
+    """Immutable integer (x, y) pair
 
-    def __iter__(self):
-        yield self.x
-        yield self.y
+    A slotted tuple: hashing, equality, ordering and unpacking all run
+    in C, and it compares and hashes equal to the matching plain tuple.
+    Arithmetic stays in python ints.
+    """
 
-    def __set__(self, instance, value):
-        super().__set__(instance, value)
-        self.x, self.y = value
+    __slots__ = ()
 
-    def __set_name__(self, owner, name):
-        super().__set_name__(owner, name)
-        owner.neighbors = self.neighbors
-        owner.distance = self.distance
+    x = property(itemgetter(0), doc="x coordinate")
+    y = property(itemgetter(1), doc="y coordinate")
+
+    def __new__(cls, x: int = 0, y: int = 0):
+        return _new(cls, (int(x), int(y)))
+
+    @property
+    def array(self):
+        return np.array(self)
 
     @property
     def neighbors(self):
-        grid = np.add((self.x, self.y), neighbor_grid)
-        return grid
+        # Removes a circular dependency
+        from .positions import PositionArray
+
+        return PositionArray(np.add(self, neighbor_grid))
+
+    def distance(self, other, func=None) -> float:
+        if not isinstance(other, tuple):
+            other = tuple(other)
+        if not func:
+            func = euclidean_distance
+        return func(self, other)
+
+    def ray(self, other, maxx=None, maxy=None, minx=None, miny=None):
+        Class = self.__class__
+        x, y = self
+        ox, oy = other
+        points = ray_offsets(int(ox) - x, int(oy) - y) + np.array((x, y))
+        if maxx or maxy or minx or miny:
+            xs, ys = points[:, 0], points[:, 1]
+            keep = np.ones(len(points), dtype=bool)
+            if maxx:
+                keep &= xs <= maxx
+            if maxy:
+                keep &= ys <= maxy
+            if minx:
+                keep &= xs >= minx
+            if miny:
+                keep &= ys >= miny
+            points = points[keep]
+        for point in points.tolist():
+            yield _new(Class, point)
+
+    def __add__(self, other):
+        x, y = self
+        ox, oy = other
+        return _new(self.__class__, (x + int(ox), y + int(oy)))
+
+    def __sub__(self, other):
+        x, y = self
+        ox, oy = other
+        return _new(self.__class__, (x - int(ox), y - int(oy)))
+
+    def __mul__(self, other):
+        x, y = self
+        if isinstance(other, (int, np.integer)):
+            other = int(other)
+            return _new(self.__class__, (x * other, y * other))
+        ox, oy = other
+        return _new(self.__class__, (x * int(ox), y * int(oy)))
+
+    # tuple + Position would otherwise concatenate the two tuples
+    def __radd__(self, other):
+        x, y = self
+        ox, oy = other
+        return _new(self.__class__, (int(ox) + x, int(oy) + y))
+
+    def __rsub__(self, other):
+        x, y = self
+        ox, oy = other
+        return _new(self.__class__, (int(ox) - x, int(oy) - y))
+
+    def __rmul__(self, other):
+        return self * other
+
+    def __neg__(self):
+        x, y = self
+        return _new(self.__class__, (-x, -y))
+
+    def __bool__(self):
+        x, y = self
+        return bool(x or y)
+
+    def __getitem__(self, item):
+        if isinstance(item, str):
+            return getattr(self, item)
+        return tuple.__getitem__(self, item)
+
+    def __getnewargs__(self):
+        return tuple(self)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __repr__(self):
+        x, y = self
+        return f"{type(self).__name__}(x={x}, y={y})"
+
+    def __str__(self):
+        return str(tuple(self))
+
+
+class Position(Coordinate):
+    __slots__ = ()
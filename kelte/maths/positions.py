@@ -0,0 +1,148 @@
+import typing
+
+import numpy as np
+
+from .distance import metrics, within
+from .point import Position
+
+# Position batches
+#   An (N, 2) int array of x, y pairs that can stand in for a list of
+#   Position objects; math runs over the whole batch at once and points
+#   are only boxed into Position when read one at a time.
+
+
+class PositionArray:
+    __slots__ = ("array",)
+
+    def __init__(self, data: typing.Any = None):
+        if isinstance(data, PositionArray):
+            data = data.array
+        elif data is None:
+            data = ()
+        self.array = np.asarray(data, dtype=np.int64).reshape(-1, 2)
+
+    @classmethod
+    def from_rect(cls, x0: int, y0: int, x1: int, y1: int) -> "PositionArray":
+        """Every cell with x0 <= x < x1 and y0 <= y < y1, row-major"""
+        ys, xs = np.mgrid[y0:y1, x0:x1]
+        return cls(np.stack([xs.ravel(), ys.ravel()], axis=-1))
+
+    @classmethod
+    def from_mask(cls, mask: np.ndarray) -> "PositionArray":
+        """Cells selected by a [y, x] boolean mask, row-major"""
+        ys, xs = np.nonzero(mask)
+        return cls(np.stack([xs, ys], axis=-1))
+
+    @classmethod
+    def from_flat(cls, indices: np.ndarray, width: int) -> "PositionArray":
+        ys, xs = np.divmod(np.asarray(indices, dtype=np.int64), width)
+        return cls(np.stack([xs, ys], axis=-1))
+
+    @property
+    def xs(self) -> np.ndarray:
+        return self.array[:, 0]
+
+    @property
+    def ys(self) -> np.ndarray:
+        return self.array[:, 1]
+
+    def to_flat(self, width: int) -> np.ndarray:
+        """Flat (row-major) indices into a grid `width` cells wide"""
+        return self.ys * width + self.xs
+
+    def distance(self, other, metric: str = "euclidean") -> np.ndarray:
+        """Distance from every point to `other` (a point or a batch of the
+        same length); see kelte.maths.distance.metrics"""
+        return metrics[metric](self.array, _coordinates(other))
+
+    def within(self, center, radius: float, metric: str = "euclidean") -> "PositionArray":
+        """The points at most `radius` away from `center`"""
+        return PositionArray(self.array[within(self.array, _coordinates(center), radius, metric)])
+
+    def inside(self, width: int, height: int, minx: int = 0, miny: int = 0) -> np.ndarray:
+        """Boolean mask of points with minx <= x < width and miny <= y < height"""
+        xs, ys = self.xs, self.ys
+        return (minx <= xs) & (xs < width) & (miny <= ys) & (ys < height)
+
+    def crop(self, width: int, height: int, minx: int = 0, miny: int = 0) -> "PositionArray":
+        """Drops the points outside of the bounds"""
+        return PositionArray(self.array[self.inside(width, height, minx, miny)])
+
+    def clip(self, width: int, height: int, minx: int = 0, miny: int = 0) -> "PositionArray":
+        """Clamps every point into the bounds"""
+        return PositionArray(np.clip(self.array, (minx, miny), (width - 1, height - 1)))
+
+    def isin(self, other) -> np.ndarray:
+        """Boolean mask of the points that also appear in `other`"""
+        return np.isin(_keys(self.array), _keys(_coordinates(other)))
+
+    def index(self, position) -> int:
+        """Index of the first matching point (like list.index)"""
+        matches = np.flatnonzero((self.array == _coordinates(position)).all(axis=-1))
+        if not len(matches):
+            raise ValueError(f"{position} is not in {type(self).__name__}")
+        return int(matches[0])
+
+    def pop(self, index: int = -1) -> Position:
+        position = self[index]
+        self.array = np.delete(self.array, index, axis=0)
+        return position
+
+    def tolist(self) -> typing.List[Position]:
+        return [Position(x, y) for x, y in self.array.tolist()]
+
+    def __add__(self, other):
+        return PositionArray(self.array + _coordinates(other))
+
+    def __sub__(self, other):
+        return PositionArray(self.array - _coordinates(other))
+
+    def __array__(self, dtype=None, copy=None):
+        # follows numpy's copy keyword: True always copies, False never
+        # does, and by default the buffer is shared read-only so that
+        # np.asarray can't be used to edit the positions in place
+        dtype = self.array.dtype if dtype is None else np.dtype(dtype)
+        if copy or dtype != self.array.dtype:
+            if copy is False:
+                raise ValueError(f"converting a {type(self).__name__} to {dtype} requires a copy")
+            return self.array.astype(dtype)
+        view = self.array.view()
+        view.flags.writeable = False
+        return view
+
+    def __contains__(self, position):
+        return bool((self.array == _coordinates(position)).all(axis=-1).any())
+
+    def __eq__(self, other):
+        try:
+            return np.array_equal(self.array, _coordinates(other))
+        except (TypeError, ValueError):
+            return NotImplemented
+
+    def __getitem__(self, item):
+        if isinstance(item, (int, np.integer)):
+            x, y = self.array[item].tolist()
+            return Position(x, y)
+        return PositionArray(self.array[item])
+
+    def __iter__(self):
+        for x, y in self.array.tolist():
+            yield Position(x, y)
+
+    def __len__(self):
+        return len(self.array)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.array.tolist()!r})"
+
+
+def _coordinates(value) -> np.ndarray:
+    if isinstance(value, PositionArray):
+        return value.array
+    return np.asarray(value, dtype=np.int64)
+
+
+def _keys(array: np.ndarray) -> np.ndarray:
+    # packs (x, y) pairs into a single int64 each
+    array = np.asarray(array, dtype=np.int64).reshape(-1, 2)
+    return (array[:, 0] << 32) + (array[:, 1] & 0xFFFFFFFF)
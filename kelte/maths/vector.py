@@ -1,12 +1,8 @@
-from dataclasses import dataclass, field
+from .point import Coordinate
 
-from .point import Point
 
-
-@dataclass()
-class Direction(Point):
-    x: int = 0
-    y: int = 0
+class Direction(Coordinate):
+    __slots__ = ()
 
 
 NONE: Direction = Direction(0, 0)
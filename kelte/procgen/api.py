@@ -1,17 +1,22 @@
+import multiprocessing
+import multiprocessing.pool
 import random
 import typing
 
-from ..config import settings
+import numpy as np
+
 from ..maths.vector import UP, UP_RIGHT, UP_LEFT, DOWN, DOWN_LEFT, DOWN_RIGHT, LEFT, RIGHT
-from ..maths import Position
-from ..tiles import Tile, get_tile
+from ..maths import Position, PositionArray
+from ..tiles import Tile, TileGrid, get_tile, tile_id
+from ..tiles.grid import palette, tile_flags
 from ..utils import terminal
+from .connectivity import connect_rooms
 from .cooridors import Cooridor
 from .levels import Level
 from ..ecs import Entity
 from kelte.mobs import get_mob
 from kelte.items import get_item
-from .rooms import Room
+from .rooms import Room, RoomPlacer
 
 
 def create_door(position: Position, tile: Tile, level: Level) -> typing.Union[Tile, None]:
@@ -39,9 +44,80 @@ def create_door(position: Position, tile: Tile, level: Level) -> typing.Union[Ti
                 return door
 
 
-def create_dungeon(level_count=None, width=None, height=None):
+def door_pattern(walls: np.ndarray, floors: np.ndarray) -> np.ndarray:
+    """Cells that `create_door` turns into doors: a floor gap in a wall
+    with floor on one side diagonally and wall on the other
+
+    `walls` and `floors` are [y, x] masks padded by one cell on every
+    side; the result covers the unpadded cells.
+    """
+    height, width = walls.shape[0] - 2, walls.shape[1] - 2
+
+    def shifted(mask, direction):
+        dx, dy = direction
+        return mask[1 + dy:height + 1 + dy, 1 + dx:width + 1 + dx]
+
+    wall = {direction: shifted(walls, direction) for direction in (UP, DOWN, LEFT, RIGHT, UP_LEFT, UP_RIGHT, DOWN_LEFT, DOWN_RIGHT)}
+    floor = {direction: shifted(floors, direction) for direction in wall}
+
+    vertical_wall = wall[UP] & wall[DOWN]
+    horizontal_gap = floor[LEFT] & floor[RIGHT] & (
+        ((floor[UP_RIGHT] | floor[DOWN_RIGHT]) & (wall[UP_LEFT] | wall[DOWN_LEFT]))
+        | ((wall[UP_RIGHT] | wall[DOWN_RIGHT]) & (floor[UP_LEFT] | floor[DOWN_LEFT]))
+    )
+    vertical_gap = wall[LEFT] & wall[RIGHT] & floor[UP] & floor[DOWN] & (
+        ((floor[UP_RIGHT] | floor[UP_LEFT]) & (wall[DOWN_RIGHT] | wall[DOWN_LEFT]))
+        | ((wall[UP_RIGHT] | wall[UP_LEFT]) & (floor[DOWN_RIGHT] | floor[DOWN_LEFT]))
+    )
+    return shifted(floors, (0, 0)) & ((vertical_wall & horizontal_gap) | (~vertical_wall & vertical_gap))
+
+
+def place_doors(level: Level) -> np.ndarray:
+    """Adds doors wherever `door_pattern` matches; returns the door mask
+
+    Matches the old cell by cell `create_door` pass exactly: one random
+    door type is drawn per floor cell in row-major order, and a door
+    placed earlier in that order stops counting as floor for the cells
+    after it.
+    """
+    terminal.echo('Adding doors')
+    tiles = level.tiles
+    wall, floor = get_tile('wall', copy=False), get_tile('floor', copy=False)
+    walls = np.zeros((level.height + 2, level.width + 2), dtype=bool)
+    floors = np.zeros_like(walls)
+    walls[1:-1, 1:-1] = (tiles.ids == tile_id(wall)) & (tiles.flags == tile_flags(wall))
+    floors[1:-1, 1:-1] = (tiles.ids == tile_id(floor)) & (tiles.flags == tile_flags(floor))
+
+    door_names = ['closed door', 'hidden door']
+    is_floor = (tiles.ids == tile_id(floor)).ravel()
+    kinds = [random.choice(door_names) for _ in range(int(is_floor.sum()))]
+    rank = np.cumsum(is_floor) - 1  # draw index of every floor cell
+
+    doors = np.zeros((level.height, level.width), dtype=bool)
+    for index in np.flatnonzero(door_pattern(walls, floors)).tolist():
+        y, x = divmod(index, level.width)
+        # earlier doors (left or in the row above) may break the pattern
+        if doors[max(y - 1, 0):y + 1, max(x - 1, 0):x + 2].any():
+            if not door_pattern(walls[y:y + 3, x:x + 3], floors[y:y + 3, x:x + 3])[0, 0]:
+                continue
+        doors[y, x] = True
+        floors[y + 1, x + 1] = False
+        level[x, y] = get_tile(kinds[rank[index]])
+    return doors
+
+
+def create_dungeon(level_count=None, width=None, height=None, seed: int = None, processes: int = None):
+    """Builds `level_count` levels, each starting from a copy of a room
+    on the level before it
+
+    When `processes` is given the levels are built in that many worker
+    processes.  Each level then gets its own seed derived from `seed`, so
+    the dungeon only depends on `seed` and not on the number of workers.
+    """
     level_count = level_count or 5
     width, height = width or random.randint(50, 150), height or random.randint(50, 150)
+    if processes is not None:
+        return _create_dungeon_parallel(level_count, width, height, seed, processes)
 
     levels = []
     terminal.echo("Building dungeon...")
@@ -58,23 +134,256 @@ def create_dungeon(level_count=None, width=None, height=None):
     return levels
 
 
+def _create_dungeon_parallel(level_count: int, width: int, height: int, seed: int = None, processes: int = 0) -> typing.List[Level]:
+    seed = random.getrandbits(64) if seed is None else seed
+    terminal.echo("Building dungeon...")
+    jobs = list(_level_jobs(level_count, width, height, seed))
+    if processes == 1:
+        encoded = [_build_level(job) for job in jobs]
+    else:
+        with multiprocessing.Pool(processes or None, initializer=_initialize_worker) as pool:
+            encoded = pool.map(_build_level, jobs)
+    terminal.echo("Dungeon built...")
+    return [decode_level(data) for data in encoded]
+
+
+def _level_jobs(level_count: int, width: int, height: int, seed: int) -> typing.Iterator[tuple]:
+    # Room placement is cheap and is all a level needs from the one before
+    # it, so the seed rooms are chained here and the rest can run anywhere
+    master = random.Random(seed)
+    level_seeds = [master.getrandbits(64) for _ in range(level_count)]
+    seed_room = None
+    for level_seed in level_seeds:
+        yield level_seed, width, height, seed_room
+        layout = _seeded(level_seed, create_layout, width=width, height=height, rooms=_rooms(seed_room))
+        room = master.choice(layout.rooms)
+        seed_room = (room.x, room.y, room.width, room.height)
+
+
+class LazyDungeon:
+    """A dungeon whose levels are only built when first needed
+
+    Reads like the list `create_dungeon` returns, and holds the same
+    levels as create_dungeon(..., seed=seed, processes=...).  Whenever a
+    level is fetched the next `prefetch_depth` levels start building in
+    background worker processes (with no workers they are built on
+    demand instead).
+    """
+
+    def __init__(self, level_count=None, width=None, height=None, seed: int = None, processes: int = 1, prefetch_depth: int = 1):
+        self.level_count = level_count or 5
+        self.width = width or random.randint(50, 150)
+        self.height = height or random.randint(50, 150)
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self.processes = processes
+        self.prefetch_depth = prefetch_depth
+        self.levels: typing.Dict[int, Level] = {}
+        self._jobs = _level_jobs(self.level_count, self.width, self.height, self.seed)
+        self._job_list: typing.List[tuple] = []
+        self._pending: typing.Dict[int, multiprocessing.pool.AsyncResult] = {}
+        self._pool = None
+
+    def prefetch(self, index: int):
+        """Starts building level `index` in the background"""
+        if not self.processes or not 0 <= index < self.level_count:
+            return
+        if index in self.levels or index in self._pending:
+            return
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(self.processes, initializer=_initialize_worker)
+        self._pending[index] = self._pool.apply_async(_build_level, (self._job(index),))
+
+    def built(self, index: int) -> bool:
+        return index in self.levels
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool = None
+        self._pending.clear()
+
+    def _job(self, index: int) -> tuple:
+        while len(self._job_list) <= index:
+            self._job_list.append(next(self._jobs))
+        return self._job_list[index]
+
+    def _level(self, index: int) -> Level:
+        level = self.levels.get(index)
+        if level is None:
+            pending = self._pending.pop(index, None)
+            if pending is not None:
+                level = decode_level(pending.get())
+            else:
+                level_seed, width, height, seed_room = self._job(index)
+                level = _seeded(level_seed, create_level, width=width, height=height, rooms=_rooms(seed_room))
+            self.levels[index] = level
+        for depth in range(1, self.prefetch_depth + 1):
+            self.prefetch(index + depth)
+        return level
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.level_count))]
+        if index < 0:
+            index += self.level_count
+        if not 0 <= index < self.level_count:
+            raise IndexError(f"level {index} is outside of a {self.level_count} level dungeon")
+        return self._level(index)
+
+    def __iter__(self):
+        for index in range(self.level_count):
+            yield self[index]
+
+    def __len__(self):
+        return self.level_count
+
+    def __repr__(self):
+        return f"{type(self).__name__}(levels={self.level_count}, built={sorted(self.levels)}, seed={self.seed})"
+
+
+def _build_level(job) -> dict:
+    level_seed, width, height, seed_room = job
+    level = _seeded(level_seed, create_level, width=width, height=height, rooms=_rooms(seed_room))
+    return encode_level(level)
+
+
+def _initialize_worker():
+    # forked workers inherit the registries; spawned ones load them
+    from ..initialization import find_data
+    from ..items import item_registry, populate_item_data
+    from ..mobs import mob_registry, populate_mob_data
+    from ..tiles import populate_tile_data
+
+    if not mob_registry or not item_registry or not Tile.registry:
+        data = find_data()
+        populate_tile_data(data)
+        populate_mob_data(data)
+        populate_item_data(data)
+
+
+def _rooms(seed_room: typing.Tuple[int, int, int, int] = None) -> typing.List[Room]:
+    if seed_room is None:
+        return []
+    x, y, width, height = seed_room
+    return [Room(width=width, height=height, position=Position(x, y))]
+
+
+def _seeded(seed: int, function: typing.Callable, *args, **kwds):
+    # runs `function` on a fixed random stream and restores the global one
+    state = random.getstate()
+    random.seed(seed)
+    try:
+        return function(*args, **kwds)
+    finally:
+        random.setstate(state)
+
+
+def encode_level(level: Level) -> dict:
+    """Flattens a level into arrays (plus a few names) that are cheap to
+    pickle and independent of the process-local tile palette"""
+    grid = level.grid
+    used = np.unique(grid.ids)
+    local = np.zeros(len(palette), dtype=np.uint16)
+    local[used] = np.arange(len(used))
+
+    rooms = {id(room): index for index, room in enumerate(level.rooms)}
+    doors = [(index, door.x, door.y) for index, room in enumerate(level.rooms) for door in room.doors]
+    # the player (and anything else that isn't generated) is not stored
+    entities = [
+        (position, entity) for position, entity in level.entities.items() if entity.type.startswith(("mob", "item"))
+    ]
+    return {
+        "width": level.width,
+        "height": level.height,
+        "tiles": [palette[value] for value in used.tolist()],
+        "ids": local[grid.ids],
+        "flags": grid.flags.copy(),
+        "rooms": np.array([(room.x, room.y, room.width, room.height) for room in level.rooms], dtype=np.int32).reshape(-1, 4),
+        "doors": np.array(doors, dtype=np.int32).reshape(-1, 3),
+        "cooridors": np.array(
+            [(rooms[id(cooridor.start_room)], rooms[id(cooridor.end_room)]) for cooridor in level.cooridors], dtype=np.int32
+        ).reshape(-1, 2),
+        "cooridor_offsets": np.cumsum([0] + [len(cooridor) for cooridor in level.cooridors]).astype(np.int64),
+        "cooridor_points": np.concatenate(
+            [np.array(cooridor.positions, dtype=np.int32) for cooridor in level.cooridors] or [np.empty((0, 2), dtype=np.int32)]
+        ),
+        "entities": [(entity.name, entity.type) for _, entity in entities],
+        "entity_positions": np.array([tuple(position) for position, _ in entities], dtype=np.int32).reshape(-1, 2),
+    }
+
+
+def decode_level(data: dict) -> Level:
+    """Rebuilds a level from `encode_level` output"""
+    level = Level(data["width"], data["height"])
+    grid = TileGrid(level.width, level.height)
+    ids = np.array([tile_id(name) for name in data["tiles"]], dtype=np.uint16)
+    grid.ids[...] = ids[data["ids"]]
+    grid.flags[...] = data["flags"]
+    level._grid = grid
+
+    for x, y, width, height in data["rooms"].tolist():
+        level.rooms.append(Room(width=width, height=height, position=Position(x, y)))
+    for index, x, y in data["doors"].tolist():
+        level.rooms[index].doors.append(Position(x, y))
+
+    offsets = data["cooridor_offsets"].tolist()
+    points = data["cooridor_points"]
+    for index, (start, end) in enumerate(data["cooridors"].tolist()):
+        cells = points[offsets[index]:offsets[index + 1]]
+        level.cooridors.append(Cooridor.from_cells(level.rooms[start], level.rooms[end], cells[:, 0], cells[:, 1]))
+
+    for (name, kind), (x, y) in zip(data["entities"], data["entity_positions"].tolist()):
+        entity = create_mob(name) if kind.startswith("mob") else create_item(name)
+        entity.position = Position(x, y)
+        level.entities.add(entity, entity.position)
+    return level
+
+
 def create_item(name: str = None) -> Entity:
     items = ['sword', 'dagger', 'cloak', 'boots', 'gloves']
     new_item = get_item(name=name or random.choice(items))
     return new_item
 
 
-def create_level(width=None, height=None, room_count: int = None, rooms: typing.List[Room] = None) -> Level:
-    room_count = room_count or random.randint(8, 12)
-    max_attempts = room_count * 5
+def create_layout(
+    width=None,
+    height=None,
+    room_count: int = None,
+    rooms: typing.List[Room] = None,
+    density: float = None,
+    margin: int = None,
+) -> Level:
+    """A level with its rooms placed (no cooridors, doors or entities)
+
+    By default rooms are dropped at random spots, up to `room_count * 5`
+    tries.  With a `density`, rooms are instead placed on free spots
+    only until they cover that fraction of the level (or `room_count`
+    rooms, if given); each room costs one pass over the level, so even
+    50+ rooms on a large map take a predictable time.  `margin` is the
+    gap kept between rooms (see RoomPlacer).
+    """
+    if density is None:
+        room_count = room_count or random.randint(8, 12)
     width, height = random.randint(50, 150) if width is None else width, random.randint(50, 150) if height is None else height
 
     level = Level(width, height)
-    if rooms:
-        level.rooms.extend(rooms)
+    placer = RoomPlacer(width, height, margin=margin)
+    for room in rooms or []:
+        level.rooms.append(room)
+        placer.add(room)
 
-    total_space = width * height
     terminal.echo('Building rooms')
+    if density is not None:
+        _pack_rooms(level, placer, density, room_count)
+        return level
+
+    max_attempts = room_count * 5
     for attempt in range(max_attempts):
         # create the room
         position = Position(
@@ -86,63 +395,102 @@ def create_level(width=None, height=None, room_count: int = None, rooms: typing.
         new_room.position = position
 
         # Check for overlap of existing rooms
-        if any(new_room in room for room in level.rooms):
+        if placer.overlaps(new_room):
             continue
 
-        if new_room not in level:
+        if not placer.inside(new_room):
             continue
 
         # Save the room to the list of rooms
         level.rooms.append(new_room)
+        placer.add(new_room)
 
         if len(level.rooms) == room_count:
             break
 
+    return level
+
+
+def _pack_rooms(level: Level, placer: RoomPlacer, density: float, room_count: int = None, max_misses: int = 5):
+    misses = 0
+    while placer.density < density and (room_count is None or len(level.rooms) < room_count):
+        new_room = create_room()
+        spots = np.flatnonzero(placer.free_positions(new_room.width, new_room.height))
+        if not len(spots):
+            # this size no longer fits anywhere; give up after a few
+            misses += 1
+            if misses >= max_misses:
+                break
+            continue
+        misses = 0
+        y, x = divmod(int(spots[random.randrange(len(spots))]), level.width)
+        new_room.position = Position(x, y)
+        level.rooms.append(new_room)
+        placer.add(new_room)
+
+
+def create_level(
+    width=None,
+    height=None,
+    room_count: int = None,
+    rooms: typing.List[Room] = None,
+    density: float = None,
+    margin: int = None,
+    cooridor_style: str = "l",
+    connectivity: str = "chain",
+    loops: float = 0.15,
+) -> Level:
+    """
+    Args:
+        connectivity: "chain" joins every room to the one placed before
+            it; "mst" joins them along a minimum spanning tree of the
+            room centers plus `loops` x room count shortcut edges
+    """
+    level = create_layout(width=width, height=height, room_count=room_count, rooms=rooms, density=density, margin=margin)
+    total_space = level.width * level.height
+
     # build cooridors
     terminal.echo('Building cooridors')
-    for index, room in enumerate(level.rooms):
-        start = level.rooms[index - 1]
-        end = room
-        cooridor = Cooridor(start, end)
+    if connectivity == "mst":
+        links = connect_rooms(level.rooms, loops=loops)
+    elif connectivity == "chain":
+        links = [(index - 1, index) for index in range(len(level.rooms))]
+    else:
+        raise ValueError(f"Unknown connectivity: {connectivity!r}")
+    for start, end in links:
+        cooridor = Cooridor(level.rooms[start], level.rooms[end], style=cooridor_style)
         level.cooridors.append(cooridor)
 
-    open_positions = []
+    open_positions = PositionArray()
     level_density = len(open_positions) / total_space
     terminal.echo(f'Density: {level_density:0.2f}')
-    for position, current_tile in level:
-        # Add doors
-        tile = create_door(position, current_tile, level)
-        if tile:
-            level[position] = tile
-        else:
-            open_positions.append(position)
+    doors = place_doors(level)
+    open_positions = PositionArray.from_mask(~doors)
 
     # Add mobs
-    max_mob_count = random.randint(3, len(level.rooms))
+    max_mob_count = random.randint(min(3, len(level.rooms)), max(3, len(level.rooms)))
     max_attempts = max_mob_count * 2
     for attempt in range(max_attempts):
         mob = create_mob()
 
         position = random.choice(open_positions)
         mob.position = position
-        position_index = open_positions.index(position)
-        open_positions.pop(position_index)
-        settings.entities[position] = mob
+        open_positions.pop(open_positions.index(position))
+        level.entities.add(mob, position)
 
         if len(level.mobs) >= max_mob_count:
             break
 
     # Add items
-    max_item_count = random.randint(3, len(level.rooms))
+    max_item_count = random.randint(min(3, len(level.rooms)), max(3, len(level.rooms)))
     max_attempts = max_item_count * 2
     for attempt in range(max_attempts):
         item = create_item()
 
         position = random.choice(open_positions)
-        position_index = open_positions.index(position)
-        open_positions.pop(position_index)
+        open_positions.pop(open_positions.index(position))
         item.position = position
-        settings.entities[position] = item
+        level.entities.add(item, position)
 
         if len(level.items) >= max_item_count:
             break
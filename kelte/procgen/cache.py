@@ -0,0 +1,73 @@
+import hashlib
+import os
+import typing
+from pathlib import Path
+
+from .api import create_dungeon
+from .storage import SavedDungeon, save_dungeon
+
+# Procgen cache
+#   Dungeons are a pure function of (seed, width, height, level count)
+#   and the generator code, so built dungeons are stored under a hash of
+#   those and reused instead of regenerated.  Bump GENERATOR_VERSION
+#   whenever a change alters what a seed generates; older packs then
+#   simply stop being found.
+
+GENERATOR_VERSION = 1
+SUFFIX = ".kel"
+
+
+def cache_key(seed, width: int, height: int, level_count: int, version: int = GENERATOR_VERSION) -> str:
+    # repr keeps seed 42 and seed "42" apart; they build different dungeons
+    parameters = repr((seed, int(width), int(height), int(level_count), int(version)))
+    return hashlib.sha256(parameters.encode("utf-8")).hexdigest()[:32]
+
+
+class DungeonCache:
+    """A directory of dungeon packs named by `cache_key`"""
+
+    def __init__(self, path: typing.Union[str, Path]):
+        self.path = Path(path)
+
+    def path_for(self, seed, width: int, height: int, level_count: int) -> Path:
+        return self.path / f"{cache_key(seed, width, height, level_count)}{SUFFIX}"
+
+    def get(self, seed, width: int, height: int, level_count: int) -> typing.Union[SavedDungeon, None]:
+        """The cached dungeon, or None when it hasn't been baked"""
+        path = self.path_for(seed, width, height, level_count)
+        if not path.exists():
+            return None
+        try:
+            return SavedDungeon(path)
+        except ValueError:  # truncated or foreign file; rebuild it
+            return None
+
+    def put(self, levels, seed, width: int, height: int, level_count: int) -> Path:
+        path = self.path_for(seed, width, height, level_count)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # written aside and moved in, so readers never see a partial pack
+        partial = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        save_dungeon(levels, partial)
+        os.replace(partial, path)
+        return path
+
+    def bake(self, seed, width: int, height: int, level_count: int, processes: int = 1) -> Path:
+        """Builds and stores the dungeon unless it is already cached
+
+        The levels are built in `processes` workers (0 uses every cpu),
+        the same way LazyDungeon builds them for that seed.
+        """
+        path = self.path_for(seed, width, height, level_count)
+        if self.get(seed, width, height, level_count) is None:
+            levels = create_dungeon(level_count, width, height, seed=seed, processes=processes)
+            self.put(levels, seed, width, height, level_count)
+        return path
+
+    def __contains__(self, parameters: tuple) -> bool:
+        return self.path_for(*parameters).exists()
+
+    def __iter__(self) -> typing.Iterator[Path]:
+        yield from sorted(self.path.glob(f"*{SUFFIX}"))
+
+    def __repr__(self):
+        return f"{type(self).__name__}(path={str(self.path)!r})"
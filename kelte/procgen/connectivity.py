@@ -0,0 +1,66 @@
+import random
+import typing
+
+import numpy as np
+
+from ..maths.distance import pairwise
+from .rooms import Room
+
+# Room connectivity
+#   Which rooms get a cooridor between them.  A minimum spanning tree
+#   over the room centers keeps every room reachable with the least
+#   total cooridor length; a few extra short edges between near
+#   neighbors add loops so the level isn't a pure tree.
+
+
+def room_centers(rooms: typing.Sequence[Room]) -> np.ndarray:
+    return np.array([tuple(room.center) for room in rooms], dtype=np.int64).reshape(-1, 2)
+
+
+def nearest_neighbors(distances: np.ndarray, k: int) -> typing.List[typing.Tuple[int, int]]:
+    """Edges (i, j), i < j, from every node to its k nearest others"""
+    count = len(distances)
+    k = min(k, count - 1)
+    if k <= 0:
+        return []
+    masked = distances + np.diag(np.full(count, np.inf))
+    nearest = np.argpartition(masked, k - 1, axis=1)[:, :k]
+    starts = np.repeat(np.arange(count), k)
+    ends = nearest.ravel()
+    pairs = np.unique(np.sort(np.stack([starts, ends], axis=-1), axis=1), axis=0)
+    return [tuple(pair) for pair in pairs.tolist()]
+
+
+def minimum_spanning_tree(distances: np.ndarray) -> typing.List[typing.Tuple[int, int]]:
+    """Prim's algorithm over a dense (n, n) distance table; edges are
+    (parent, child) in the order they join the tree"""
+    count = len(distances)
+    if count < 2:
+        return []
+    in_tree = np.zeros(count, dtype=bool)
+    in_tree[0] = True
+    best = distances[0].astype(np.float64)
+    parents = np.zeros(count, dtype=np.int64)
+    edges = []
+    for _ in range(count - 1):
+        child = int(np.argmin(np.where(in_tree, np.inf, best)))
+        edges.append((int(parents[child]), child))
+        in_tree[child] = True
+        closer = distances[child] < best
+        best[closer] = distances[child][closer]
+        parents[closer] = child
+    return edges
+
+
+def connect_rooms(
+    rooms: typing.Sequence[Room], loops: float = 0.15, neighbors: int = 4
+) -> typing.List[typing.Tuple[int, int]]:
+    """Room index pairs to join with cooridors: a minimum spanning tree
+    plus `loops` x len(rooms) extra edges drawn from the `neighbors`
+    nearest rooms of each room"""
+    distances = pairwise(room_centers(rooms), room_centers(rooms))
+    edges = minimum_spanning_tree(distances)
+    tree = {tuple(sorted(edge)) for edge in edges}
+    candidates = [edge for edge in nearest_neighbors(distances, neighbors) if edge not in tree]
+    extra = min(len(candidates), int(round(loops * len(rooms))))
+    return edges + random.sample(candidates, extra)
@@ -1,17 +1,35 @@
 import random
+import typing
 
-from ..maths import Position
+import numpy as np
+
+from ..maths import Position, PositionArray
+from ..maths.bresenham import ray_offsets
 from ..tiles import get_tile
 from .rooms import Room
 
+# Cooridor carving
+#   A cooridor is a pair of coordinate arrays (xs, ys) from the start
+#   room's center to the end room's.  Levels write them into the tile
+#   grid with one fancy-indexed assignment; Tile objects are only made
+#   if something iterates the cooridor.
+
+styles = ("l", "straight", "jitter")
+
 
 class Cooridor:
     @property
-    def points(self):
+    def points(self) -> typing.List[typing.Tuple[Position, typing.Any]]:
+        """(position, floor tile) for every cell"""
         if not hasattr(self, "_points"):
-            self._build()
+            default_tile = get_tile("floor")
+            self._points = [(position, default_tile.copy()) for position in self.positions]
         return self._points
 
+    @property
+    def positions(self) -> PositionArray:
+        return PositionArray(np.stack([self.xs, self.ys], axis=-1))
+
     @property
     def start(self):
         return self.start_room.center
@@ -20,65 +38,104 @@ class Cooridor:
     def end(self):
         return self.end_room.center
 
-    def __init__(self, start: Room, end: Room):
+    def __init__(self, start: Room, end: Room, style: str = "l", jitter: float = 1.0):
+        """
+        Args:
+            style: "l" runs along one axis then the other, "straight"
+                follows a line between the centers and "jitter" wanders
+                toward the end room one orthogonal step at a time
+            jitter: how far a "jitter" cooridor strays from a straight line
+        """
+        if style not in styles:
+            raise ValueError(f"Unknown cooridor style: {style!r} (expected one of {styles})")
         self.start_room = start
         self.end_room = end
+        self.style = style
+        self.jitter = jitter
         self._build()
 
+    @classmethod
+    def from_cells(cls, start: Room, end: Room, xs: np.ndarray, ys: np.ndarray) -> "Cooridor":
+        """A cooridor over already carved cells (doors are not marked)"""
+        cooridor = cls.__new__(cls)
+        cooridor.start_room, cooridor.end_room = start, end
+        cooridor.style, cooridor.jitter = None, None
+        cooridor.xs = np.asarray(xs, dtype=np.int64)
+        cooridor.ys = np.asarray(ys, dtype=np.int64)
+        return cooridor
+
+    def carve(self, grid, tile=None):
+        """Writes the cooridor into a TileGrid"""
+        grid.blit(self.xs, self.ys, get_tile("floor", copy=False) if tile is None else tile)
+
     def __iter__(self):
         yield from self.points
 
-    def _build(self):
-        self._points = []
-        xmin = min((self.start.x, self.end.x))
-        xmax = max((self.start.x, self.end.x)) + 1
-        ymin = min((self.start.y, self.end.y))
-        ymax = max((self.start.y, self.end.y)) + 1
-
-        default_tile = get_tile("floor")
-
-        build_horizontal_first = random.randint(0, 1)
-
-        if build_horizontal_first:
-            in_room = True
-            last_position = Position()
-            for x in range(xmin, xmax):
-                position = Position(x, self.start.y)
-                if position not in self.start_room:
-                    if in_room is True:
-                        self.start_room.doors.append(last_position)
-                        in_room = False
-                self._points.append((position, default_tile.copy()))
-                last_position = position
-
-            last_position = Position()
-            for y in range(ymin, ymax):
-                position = Position(self.end.x, y)
-                if position in self.end_room:
-                    if in_room is False:
-                        self.end_room.doors.append(last_position)
-                        in_room = True
-                self._points.append((position, default_tile.copy()))
-                last_position = position
+    def __len__(self):
+        return len(self.xs)
 
+    def _build(self):
+        if self.style == "l":
+            first, second = self._l_shape()
+            if self._mark_exit(*first) is not None:
+                self._mark_entry(*second)
+            xs, ys = np.concatenate([first[0], second[0]]), np.concatenate([first[1], second[1]])
         else:
-            in_room = True
-            last_position = Position()
-            for y in range(ymin, ymax):
-                position = Position(self.start.x, y)
-                if position not in self.start_room:
-                    if in_room is True:
-                        self.start_room.doors.append(last_position)
-                        in_room = False
-                self._points.append((position, default_tile.copy()))
-                last_position = position
-
-            last_position = Position()
-            for x in range(xmin, xmax):
-                position = Position(x, self.end.y)
-                if position in self.end_room:
-                    if in_room is False:
-                        self.end_room.doors.append(last_position)
-                        in_room = True
-                self._points.append((position, default_tile.copy()))
-                last_position = position
+            xs, ys = self._straight() if self.style == "straight" else self._jittered()
+            leave = self._mark_exit(xs, ys)
+            if leave is not None:
+                self._mark_entry(xs[leave:], ys[leave:], previous=(xs[leave - 1], ys[leave - 1]) if leave else None)
+        self.xs, self.ys = xs, ys
+
+    def _l_shape(self):
+        (x0, y0), (x1, y1) = self.start, self.end
+        xs = np.arange(min(x0, x1), max(x0, x1) + 1)
+        ys = np.arange(min(y0, y1), max(y0, y1) + 1)
+        if random.randint(0, 1):  # horizontal first
+            return (xs, np.full_like(xs, y0)), (np.full_like(ys, x1), ys)
+        return (np.full_like(ys, x0), ys), (xs, np.full_like(xs, y1))
+
+    def _straight(self):
+        (x0, y0), (x1, y1) = self.start, self.end
+        offsets = ray_offsets(x1 - x0, y1 - y0)
+        offsets = offsets.astype(np.int64)
+        return offsets[:, 0] + x0, offsets[:, 1] + y0
+
+    def _jittered(self):
+        # a shuffled sequence of unit steps: every x step and y step is
+        # spread evenly along the way, then nudged by noise and sorted
+        (x0, y0), (x1, y1) = self.start, self.end
+        dx, dy = abs(x1 - x0), abs(y1 - y0)
+        generator = np.random.default_rng(random.getrandbits(64))
+        keys = np.concatenate([(np.arange(dx) + 0.5) / max(dx, 1), (np.arange(dy) + 0.5) / max(dy, 1)])
+        keys += generator.normal(scale=0.25 * self.jitter, size=len(keys))
+        order = np.argsort(keys, kind="stable")
+        steps = np.zeros((dx + dy, 2), dtype=np.int64)
+        steps[:dx, 0] = np.sign(x1 - x0)
+        steps[dx:, 1] = np.sign(y1 - y0)
+        path = np.concatenate([[[x0, y0]], (x0, y0) + np.cumsum(steps[order], axis=0)])
+        return path[:, 0], path[:, 1]
+
+    def _mark_exit(self, xs: np.ndarray, ys: np.ndarray) -> typing.Union[int, None]:
+        # the cell before the cooridor first leaves the start room
+        outside = np.flatnonzero(~_inside(self.start_room, xs, ys))
+        if not len(outside):
+            return None
+        index = int(outside[0])
+        self.start_room.doors.append(Position(int(xs[index - 1]), int(ys[index - 1])) if index else Position())
+        return index
+
+    def _mark_entry(self, xs: np.ndarray, ys: np.ndarray, previous: typing.Tuple[int, int] = None):
+        # the cell before the cooridor first reaches the end room
+        inside = np.flatnonzero(_inside(self.end_room, xs, ys))
+        if not len(inside):
+            return
+        index = int(inside[0])
+        if index:
+            previous = xs[index - 1], ys[index - 1]
+        self.end_room.doors.append(Position(*map(int, previous)) if previous is not None else Position())
+
+
+def _inside(room: Room, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    # matches Room.__contains__ for points, far edges included
+    return (room.x <= xs) & (xs <= room.x2) & (room.y <= ys) & (ys <= room.y2)
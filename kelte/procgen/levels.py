@@ -1,8 +1,15 @@
 import typing
 from dataclasses import dataclass, field
 
-from ..maths import Position
-from ..tiles import Tile, get_tile
+import numpy as np
+
+from ..flowfield import FlowFields
+from ..lightmap import LightMap
+from ..maths import Position, PositionArray
+from ..spatial import EntityIndex
+from ..tiles import Tile, TileFlag, TileGrid, get_tile
+from ..tiles.grid import flag_names
+from ..visibility import VisibilityCache
 from .cooridors import Cooridor
 from ..ecs import Entity
 from .rooms import Room
@@ -32,6 +39,7 @@ class Level:
     cooridors: typing.List[Cooridor] = field(default_factory=list)
     mobs: typing.List[Entity] = field(default_factory=list)
     items: typing.List[Entity] = field(default_factory=list)
+    storage: str = "array"  # "array" (TileGrid) or "list" (list of lists of Tile)
 
     @property
     def grid(self):
@@ -39,27 +47,83 @@ class Level:
             self._populate()
         return self._grid
 
+    @property
+    def tiles(self) -> TileGrid:
+        """Array-backed tile storage; builds a snapshot in list mode"""
+        if self.storage == "array":
+            return self.grid
+        tiles = TileGrid(self.width, self.height)
+        for position, tile in self:
+            tiles[position] = tile
+        return tiles
+
+    @property
+    def transparency(self) -> np.ndarray:
+        return ~self.tiles.mask(TileFlag.OPAQUE)
+
+    @property
+    def walkability(self) -> np.ndarray:
+        return self.tiles.mask(TileFlag.WALKABLE)
+
+    def update_flags(self, flag: TileFlag, mask: np.ndarray, value: bool = True):
+        """Sets (or clears) a tile flag on every cell selected by `mask`"""
+        if self.storage == "array":
+            self.grid.set_mask(flag, mask, value)
+            return
+        names = [name for name, bit in flag_names.items() if flag & bit]
+        for y, x in np.argwhere(mask):
+            for name in names:
+                setattr(self.grid[y][x], name, value)
+
+    @property
+    def visibility(self) -> VisibilityCache:
+        """Last rendered view/light frames for this level"""
+        if not hasattr(self, "_visibility"):
+            self._visibility = VisibilityCache()
+        return self._visibility
+
+    @property
+    def entities(self) -> EntityIndex:
+        """Mobs, items and the player, indexed by position"""
+        if not hasattr(self, "_entities"):
+            self._entities = EntityIndex(self.width, self.height)
+        return self._entities
+
+    @property
+    def lights(self) -> LightMap:
+        """Light sources on this level and their accumulated light"""
+        if not hasattr(self, "_lights"):
+            self._lights = LightMap(self.width, self.height)
+        return self._lights
+
+    @property
+    def flow_fields(self) -> FlowFields:
+        """Shared movement maps toward goals on this level"""
+        if not hasattr(self, "_flow_fields"):
+            self._flow_fields = FlowFields(self)
+        return self._flow_fields
+
     @property
     def edges(self):
         if not hasattr(self, '_edges'):
-            edges = []
-            for x in range(0, self.width):
-                edges.append(Position(x, 0))
-                edges.append(Position(x, self.height))
-            for y in range(0, self.height):
-                edges.append(Position(0, y))
-                edges.append(Position(self.height, y))
-            self._edges = edges
-        yield from self._edges
+            xs, ys = np.arange(self.width), np.arange(self.height)
+            top_bottom = np.stack([xs, np.zeros_like(xs), xs, np.full_like(xs, self.height)], axis=-1)
+            left_right = np.stack([np.zeros_like(ys), ys, np.full_like(ys, self.height), ys], axis=-1)
+            self._edges = PositionArray(np.concatenate([top_bottom.reshape(-1, 2), left_right.reshape(-1, 2)]))
+        return self._edges
 
     def __getitem__(self, key):
-        x, y = tuple(key)
-        value = self.grid[y][x]
-        return value
+        x, y = key
+        if self.storage == "array":
+            return self.grid[x, y]
+        return self.grid[y][x]
 
     def __setitem__(self, key, value):
         x, y = key
-        self.grid[y][x] = value
+        if self.storage == "array":
+            self.grid[x, y] = value
+        else:
+            self.grid[y][x] = value
 
     def __contains__(self, other):
         contained = False
@@ -73,6 +137,10 @@ class Level:
         return contained
 
     def _populate(self):
+        if self.storage == "array":
+            self._grid = self._populate_array()
+            return
+
         data = []
 
         default_tile = get_tile("wall")
@@ -94,20 +162,27 @@ class Level:
             for position, tile in cooridor:
                 data[position.y][position.x] = tile
 
-        # blit dungeon artifacts onto level
+        self._grid = data
 
-        # blit entities onto levels
-        open_locations = [
-            (x, y)
-            for x in range(self.width)
-            for y in range(self.height)
-            if data[y][x].transparent
-        ]
+    def _populate_array(self) -> TileGrid:
+        grid = TileGrid(self.width, self.height, fill=get_tile("wall", copy=False))
 
+        # blit rooms onto level
+        for room in self.rooms:
+            for position, tile in room:
+                grid[position] = tile
 
-        self._grid = data
+        # carve cooridors into the level
+        for cooridor in self.cooridors:
+            cooridor.carve(grid)
+
+        return grid
 
     def __iter__(self):
+        if self.storage == "array":
+            for tile in self.grid:
+                yield Position(tile.x, tile.y), tile
+            return
         for y, row in enumerate(self.grid):
             for x, tile in enumerate(row):
                 yield Position(x, y), tile
@@ -116,5 +191,9 @@ class Level:
         return f"{type(self).__name__}(width={self.width}, height={self.height}, room_count={len(self.rooms)})"
 
     def __str__(self):
-        string = "\n".join("".join(tile.rendered for tile in row) for row in self.grid)
+        if self.storage == "array":
+            rows = ([self[x, y] for x in range(self.width)] for y in range(self.height))
+        else:
+            rows = self.grid
+        string = "\n".join("".join(tile.rendered for tile in row) for row in rows)
         return string
@@ -1,14 +1,16 @@
+import typing
 from dataclasses import dataclass, field
 
 import numpy as np
-import scipy.optimize as spo
 
-from ..maths import Position
+from ..maths import Position, PositionArray
 from ..tiles import get_tile
 
 
 def in_hull(points, point):
     # Adapted from: https://stackoverflow.com/a/43564754/631199
+    import scipy.optimize as spo  # slow to import and nothing else needs it
+
     number_of_points = len(points)
     c = np.zeros(number_of_points)
     A = np.r_[points.T, np.ones((1, number_of_points))]
@@ -87,10 +89,14 @@ class Room:
 
         return contained
 
+    @property
+    def positions(self) -> PositionArray:
+        """Every cell of the room, row-major"""
+        return PositionArray.from_rect(self.x, self.y, self.x2, self.y2)
+
     def __iter__(self):
-        for y, row in enumerate(self.points):
-            for x, tile in enumerate(row):
-                yield Position(x + self.x, y + self.y), tile
+        tiles = (tile for row in self.points for tile in row)
+        yield from zip(self.positions, tiles)
 
     def __getitem__(self, item):
         y, x = item
@@ -109,3 +115,76 @@ class Room:
             row = "".join(map(str, row))
             data.append(row)
         return "\n".join(data)
+
+
+# Room placement
+#   An occupancy bitmap of the cells taken by rooms.  Overlap checks are
+#   a slice of the bitmap instead of walking every tile of every room,
+#   and a summed-area table finds every spot a room of a given size
+#   still fits in one pass.
+
+
+class RoomPlacer:
+    def __init__(self, width: int, height: int, margin: int = None):
+        """
+        Args:
+            margin: empty cells kept around every room.  None keeps the
+                original rule: a room may not reach a placed room on its
+                right/bottom edge but may touch one on its left/top.
+        """
+        self.width = width
+        self.height = height
+        self.margin = margin
+        self.occupied = np.zeros((height, width), dtype=bool)
+        self.rooms = []
+
+    @property
+    def density(self) -> float:
+        """Fraction of the map covered by rooms"""
+        return float(self.occupied.mean())
+
+    def add(self, room: Room):
+        self.occupied[max(room.y, 0):room.y2, max(room.x, 0):room.x2] = True
+        self.rooms.append(room)
+
+    def overlaps(self, room: Room) -> bool:
+        before, after = self._padding()
+        x0, y0 = max(room.x - before, 0), max(room.y - before, 0)
+        return bool(self.occupied[y0:room.y2 + after, x0:room.x2 + after].any())
+
+    def inside(self, room: Room) -> bool:
+        return room.x2 < self.width and room.y2 < self.height
+
+    def fits(self, room: Room) -> bool:
+        return self.inside(room) and not self.overlaps(room)
+
+    def free_positions(self, width: int, height: int) -> np.ndarray:
+        """[y, x] mask of the top-left cells where a `width` x `height`
+        room would fit (never on the map's first row or column)"""
+        before, after = self._padding()
+        table = np.zeros((self.height + 1, self.width + 1), dtype=np.int32)
+        np.cumsum(np.cumsum(self.occupied, axis=0), axis=1, out=table[1:, 1:])
+        xs, ys = np.arange(self.width), np.arange(self.height)
+        x0, x1 = np.clip(xs - before, 0, self.width), np.clip(xs + width + after, 0, self.width)
+        y0, y1 = np.clip(ys - before, 0, self.height), np.clip(ys + height + after, 0, self.height)
+        taken = (
+            table[np.ix_(y1, x1)] - table[np.ix_(y0, x1)] - table[np.ix_(y1, x0)] + table[np.ix_(y0, x0)]
+        )
+        free = taken == 0
+        free[:, xs + width >= self.width] = False
+        free[ys + height >= self.height, :] = False
+        free[0, :] = False
+        free[:, 0] = False
+        return free
+
+    def _padding(self) -> typing.Tuple[int, int]:
+        # cells checked before the room's top-left and past its far edge
+        if self.margin is None:
+            return 0, 1
+        return self.margin, self.margin
+
+    def __len__(self):
+        return len(self.rooms)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(width={self.width}, height={self.height}, rooms={len(self)}, density={self.density:0.2f})"
@@ -0,0 +1,118 @@
+import json
+import typing
+from pathlib import Path
+
+import numpy as np
+
+from .api import decode_level, encode_level
+from .levels import Level
+
+# Level files
+#   A short JSON header followed by the raw arrays of every level, each
+#   aligned to 64 bytes.  Loading reads the header and memory-maps the
+#   arrays in place, so nothing is parsed or copied until a level is
+#   actually rebuilt.
+#
+#   magic (8 bytes) | header length (uint64, little endian) | header | arrays
+
+MAGIC = b"KELTE\x00\x01\x00"
+ALIGNMENT = 64
+
+
+def save_level(level: Level, path: typing.Union[str, Path]):
+    save_dungeon([level], path)
+
+
+def load_level(path: typing.Union[str, Path], index: int = 0) -> Level:
+    return decode_level(read_levels(path)[index])
+
+
+def save_dungeon(levels: typing.Iterable[Level], path: typing.Union[str, Path]):
+    """Writes every level (e.g. a dungeon) to a single file"""
+    encoded = [encode_level(level) for level in levels]
+    entries, arrays, offset = [], [], 0
+    for data in encoded:
+        fields, table = {}, {}
+        for name, value in data.items():
+            if isinstance(value, np.ndarray):
+                value = np.ascontiguousarray(value)
+                offset = _aligned(offset)
+                table[name] = {"dtype": value.dtype.str, "shape": list(value.shape), "offset": offset}
+                arrays.append((offset, value))
+                offset += value.nbytes
+            else:
+                fields[name] = value
+        entries.append({"fields": fields, "arrays": table})
+
+    header = json.dumps({"levels": entries}).encode("utf-8")
+    start = _aligned(len(MAGIC) + 8 + len(header))
+    with Path(path).open("wb") as stream:
+        stream.write(MAGIC)
+        stream.write(np.uint64(len(header)).tobytes())
+        stream.write(header)
+        for position, value in arrays:
+            stream.seek(start + position)
+            stream.write(value.tobytes())
+        stream.truncate(start + offset)
+
+
+def read_levels(path: typing.Union[str, Path]) -> typing.List[dict]:
+    """`encode_level` data for every level in a file, with the arrays
+    memory-mapped read-only"""
+    path = Path(path)
+    with path.open("rb") as stream:
+        magic = stream.read(len(MAGIC))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a level file")
+        length = int(np.frombuffer(stream.read(8), dtype="<u8")[0])
+        header = json.loads(stream.read(length).decode("utf-8"))
+    start = _aligned(len(MAGIC) + 8 + length)
+
+    levels = []
+    for entry in header["levels"]:
+        data = dict(entry["fields"])
+        for name, spec in entry["arrays"].items():
+            shape = tuple(spec["shape"])
+            if not np.prod(shape):
+                data[name] = np.zeros(shape, dtype=spec["dtype"])
+                continue
+            data[name] = np.memmap(path, dtype=spec["dtype"], mode="r", offset=start + spec["offset"], shape=shape)
+        data["entities"] = [tuple(entity) for entity in data["entities"]]
+        levels.append(data)
+    return levels
+
+
+class SavedDungeon:
+    """Levels from a file, rebuilt the first time each one is used"""
+
+    def __init__(self, path: typing.Union[str, Path]):
+        self.path = Path(path)
+        self.encoded = read_levels(self.path)
+        self.levels: typing.Dict[int, Level] = {}
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if index not in self.levels:
+            self.levels[index] = decode_level(self.encoded[index])
+        return self.levels[index]
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __len__(self):
+        return len(self.encoded)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(path={str(self.path)!r}, levels={len(self)})"
+
+
+def load_dungeon(path: typing.Union[str, Path]) -> SavedDungeon:
+    return SavedDungeon(path)
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
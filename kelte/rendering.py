@@ -1,14 +1,85 @@
+import time
+
+import numpy as np
 import tcod as tdl
 
 from .colors import Color
 from .config import settings
 from .ecs import Entity
 from .maths import Position
-from .tiles import Tile
+from .tiles import Tile, TileFlag
+from .tiles.grid import palette, palette_array
 from .ui.bar import Bar
 from .procgen.levels import Level
 
 
+class FrameBuffer:
+    """Double-buffered frames
+
+    Everything is drawn into the offscreen `back` console.  `present`
+    compares it with the last frame shown, copies only the cells that
+    changed onto the root console and flushes; identical frames are not
+    flushed at all.  Without a root console (headless or replay runs)
+    frames are only diffed.
+    """
+
+    def __init__(self, width: int, height: int, root=None, fps: int = None):
+        self.width = width
+        self.height = height
+        self.root = root
+        self.back = tdl.console.Console(width, height)
+        front = root if root is not None else self.back
+        self.ch = front.ch.copy()
+        self.fg = front.fg.copy()
+        self.bg = front.bg.copy()
+        self.interval = 1 / fps if fps else 0
+        self.frames = 0
+        self.skipped = 0
+        self._presented = time.monotonic()
+
+    def diff(self) -> np.ndarray:
+        """Returns a boolean mask of cells that differ from the last frame"""
+        back = self.back
+        changed = back.ch != self.ch
+        changed |= (back.fg != self.fg).any(axis=-1)
+        changed |= (back.bg != self.bg).any(axis=-1)
+        return changed
+
+    def present(self) -> np.ndarray:
+        """Pushes the changed cells to the screen; returns the changed mask"""
+        changed = self.diff()
+        if not changed.any():
+            self.skipped += 1
+            self._wait()
+            return changed
+
+        back = self.back
+        self.ch[changed] = back.ch[changed]
+        self.fg[changed] = back.fg[changed]
+        self.bg[changed] = back.bg[changed]
+        if self.root is not None:
+            root = self.root
+            root.ch[changed] = self.ch[changed]
+            root.fg[changed] = self.fg[changed]
+            root.bg[changed] = self.bg[changed]
+            tdl.console_flush()
+        self.frames += 1
+        self._presented = time.monotonic()
+        return changed
+
+    def _wait(self):
+        # console_flush paces the game loop; keep the same pace when idle
+        if self.root is None:
+            return
+        remaining = self.interval - (time.monotonic() - self._presented)
+        if remaining > 0:
+            time.sleep(remaining)
+        self._presented = time.monotonic()
+
+    def __repr__(self):
+        return f"{type(self).__name__}(width={self.width}, height={self.height})"
+
+
 def render_bar(bar: Bar):
     position = bar.position
 
@@ -22,8 +93,73 @@ def render_entity(entity: Entity):
         pass
 
 
-def render_level(level: Level):
-    pass
+def render_level(level: Level, mask: np.ndarray = None, console=None):
+    """Renders every cell of the level (or those selected by `mask`) in
+    one batch; equivalent to calling render_tile for each cell"""
+    console = settings.main_console if console is None else console
+    tiles = level.tiles
+    if mask is None:
+        # whole map: write straight through without gathering cells
+        index = np.s_[:level.height, :level.width]
+        ids, flags = tiles.ids, tiles.flags
+    else:
+        index = np.nonzero(mask)
+        ids, flags = tiles.ids[index], tiles.flags[index]
+
+    shown = (flags & (TileFlag.VISIBLE | TileFlag.EXPLORED)) != 0
+    lit = ((flags & TileFlag.LIT) != 0) & ((flags & TileFlag.VISIBLE) != 0)
+    lit = lit[..., None]
+    console.ch[index] = np.where(shown, glyph_table()[ids], settings.typeface_mapper.get(" ", 0))
+    console.fg[index] = np.where(lit, color_table('lit_color')[ids], color_table('unlit_color')[ids])
+    drawn = palette_array('background_mode')[ids] != tdl.BKGND_NONE
+    if drawn.any():
+        background = np.where(lit, color_table('background_lit_color')[ids], color_table('background_unlit_color')[ids])
+        console.bg[index] = np.where(drawn[..., None], background, console.bg[index])
+
+
+def render_cells(xs: np.ndarray, ys: np.ndarray, glyphs: np.ndarray, foreground: np.ndarray, background: np.ndarray = None, background_modes: np.ndarray = None, console=None):
+    """Writes many cells straight into the console's ch/fg/bg buffers
+
+    Colors are (n, 3) uint8 arrays.  Backgrounds are only written where
+    the background mode is not BKGND_NONE; blending modes are treated as
+    BKGND_SET.
+    """
+    console = settings.main_console if console is None else console
+    console.ch[ys, xs] = glyphs
+    console.fg[ys, xs] = foreground
+    if background is not None:
+        if background_modes is not None:
+            drawn = background_modes != tdl.BKGND_NONE
+            xs, ys, background = xs[drawn], ys[drawn], background[drawn]
+        console.bg[ys, xs] = background
+
+
+_glyph_tables = {}
+
+
+def glyph_table() -> np.ndarray:
+    """Typeface glyph index for each tile's character, indexed by grid id"""
+    mapper = settings.typeface_mapper
+    key = (len(palette), id(mapper))
+    table = _glyph_tables.get(key)
+    if table is None:
+        characters = palette_array('character')
+        table = np.array([mapper.get(c) or 0 for c in characters.tolist()], dtype=np.int32)
+        _glyph_tables.clear()
+        _glyph_tables[key] = table
+    return table
+
+
+_color_tables = {}
+
+
+def color_table(attribute: str) -> np.ndarray:
+    """(tiles, 3) uint8 colors for a tile color attribute, indexed by grid id"""
+    key = (attribute, len(palette))
+    table = _color_tables.get(key)
+    if table is None:
+        table = _color_tables[key] = (palette_array(attribute) * 255).astype(np.uint8)
+    return table
 
 
 def render_log(log: list = None):
@@ -40,6 +176,16 @@ def render_log(log: list = None):
     tdl.console_blit(panel, 0, 0, settings.screen_width, settings.log_height, 0, 0, settings.screen_height - settings.log_height)
 
 
+def render_char(x: int, y: int, character: str, foreground, background=None, background_mode: int = None):
+    """Renders a single cell from raw (r, g, b) byte colors"""
+    console = settings.main_console
+    background_mode = tdl.BKGND_NONE if background_mode is None else background_mode
+    tdl.console_put_char(console, x, y, settings.typeface_mapper.get(character), background_mode)
+    tdl.console_set_char_foreground(console, x, y, tuple(foreground))
+    if background is not None and background_mode != tdl.BKGND_NONE:
+        tdl.console_set_char_background(console, x, y, tuple(background), background_mode)
+
+
 def render_tile(position: Position, tile: Tile, foreground_color: Color = None, background_color: Color = None, background_mode: int = None):
     foreground_color = foreground_color or tile.color
     background_color = background_color or tile.background_color
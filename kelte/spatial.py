@@ -0,0 +1,178 @@
+import typing
+
+import numpy as np
+
+from .maths import Position
+
+# Entity spatial index
+#   A grid of entity slots (0 is empty) holds the top entity of every
+#   cell; cells with more than one entity keep the full stack in a
+#   bucket.  Point lookups are a single array read and moves touch two
+#   cells.  Reads like the Position-keyed dict it replaces.
+
+
+class EntityIndex:
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.ids = np.zeros((height, width), dtype=np.int32)
+        self.entities: typing.List[typing.Any] = [None]  # slot 0 is empty
+        self.positions: typing.List[typing.Tuple[int, int]] = [None]
+        self.stacks: typing.Dict[typing.Tuple[int, int], typing.List[int]] = {}
+        self._slots: typing.Dict[int, int] = {}
+        self._free: typing.List[int] = []
+
+    def add(self, entity, position: Position = None) -> int:
+        """Adds an entity on top of the cell at `position` (default:
+        entity.position); returns its slot"""
+        position = entity.position if position is None else position
+        if id(entity) in self._slots:
+            self.move(entity, position)
+            return self._slots[id(entity)]
+        cell = self._cell(position)
+        slot = self._free.pop() if self._free else len(self.entities)
+        if slot == len(self.entities):
+            self.entities.append(entity)
+            self.positions.append(cell)
+        else:
+            self.entities[slot] = entity
+            self.positions[slot] = cell
+        self._slots[id(entity)] = slot
+        self._push(slot, cell)
+        return slot
+
+    def remove(self, entity):
+        slot = self._slots.pop(id(entity))
+        self._pop(slot, self.positions[slot])
+        self.entities[slot] = None
+        self.positions[slot] = None
+        self._free.append(slot)
+
+    def move(self, entity, position: Position):
+        """Moves an entity (and updates entity.position)"""
+        slot = self._slots[id(entity)]
+        cell = self._cell(position)
+        if cell != self.positions[slot]:
+            self._pop(slot, self.positions[slot])
+            self.positions[slot] = cell
+            self._push(slot, cell)
+        entity.position = Position(*cell)
+
+    def at(self, position: Position) -> list:
+        """Every entity in a cell, bottom to top"""
+        x, y = position
+        if not self._inside(x, y):
+            return []
+        stack = self.stacks.get((x, y))
+        if stack:
+            return [self.entities[slot] for slot in stack]
+        slot = self.ids.item(y, x)
+        return [self.entities[slot]] if slot else []
+
+    def get(self, position: Position, default=None):
+        """Top entity in a cell"""
+        x, y = position
+        if not self._inside(x, y):
+            return default
+        slot = self.ids.item(y, x)
+        return self.entities[slot] if slot else default
+
+    def position_of(self, entity) -> Position:
+        return Position(*self.positions[self._slots[id(entity)]])
+
+    def in_rect(self, x0: int, y0: int, x1: int, y1: int) -> typing.Iterator[typing.Tuple[Position, typing.Any]]:
+        """Yields (position, entity) for the top entity of every occupied
+        cell with x0 <= x < x1 and y0 <= y < y1"""
+        x0, y0 = max(0, x0), max(0, y0)
+        x1, y1 = min(self.width, x1), min(self.height, y1)
+        if x0 >= x1 or y0 >= y1:
+            return
+        window = self.ids[y0:y1, x0:x1]
+        ys, xs = np.nonzero(window)
+        for x, y, slot in zip((xs + x0).tolist(), (ys + y0).tolist(), window[ys, xs].tolist()):
+            yield Position(x, y), self.entities[slot]
+
+    def in_radius(self, position: Position, radius: int) -> typing.Iterator[typing.Tuple[Position, typing.Any]]:
+        """Yields (position, entity) for occupied cells within `radius`"""
+        cx, cy = position
+        radius_squared = radius * radius
+        for point, entity in self.in_rect(cx - radius, cy - radius, cx + radius + 1, cy + radius + 1):
+            if (point.x - cx) ** 2 + (point.y - cy) ** 2 <= radius_squared:
+                yield point, entity
+
+    def select(self, mask: np.ndarray) -> typing.Iterator[typing.Tuple[Position, typing.Any]]:
+        """Yields (position, entity) for occupied cells selected by `mask`"""
+        ys, xs = np.nonzero(mask & (self.ids > 0))
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            yield Position(x, y), self.entities[self.ids.item(y, x)]
+
+    def items(self) -> typing.Iterator[typing.Tuple[Position, typing.Any]]:
+        """Yields (position, entity) for every entity"""
+        for entity, cell in zip(self.entities, self.positions):
+            if entity is not None:
+                yield Position(*cell), entity
+
+    def keys(self) -> typing.Iterator[Position]:
+        for position, entity in self.items():
+            yield position
+
+    def values(self) -> typing.Iterator[typing.Any]:
+        for entity in self.entities:
+            if entity is not None:
+                yield entity
+
+    def clear(self):
+        self.__init__(self.width, self.height)
+
+    def _cell(self, position: Position) -> typing.Tuple[int, int]:
+        # also accepts a position Component
+        x, y = (position.x, position.y) if hasattr(position, "x") else position
+        x, y = int(x), int(y)
+        if not self._inside(x, y):
+            raise IndexError(f"Position, {(x, y)}, is outside of {self.width}x{self.height}")
+        return x, y
+
+    def _inside(self, x, y) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def _push(self, slot: int, cell: typing.Tuple[int, int]):
+        x, y = cell
+        below = self.ids.item(y, x)
+        if below:
+            self.stacks.setdefault(cell, [below]).append(slot)
+        self.ids[y, x] = slot
+
+    def _pop(self, slot: int, cell: typing.Tuple[int, int]):
+        x, y = cell
+        stack = self.stacks.get(cell)
+        if stack is None:
+            self.ids[y, x] = 0
+            return
+        stack.remove(slot)
+        self.ids[y, x] = stack[-1]
+        if len(stack) == 1:
+            del self.stacks[cell]
+
+    def __contains__(self, position):
+        return self.get(position) is not None
+
+    def __getitem__(self, position):
+        entity = self.get(position)
+        if entity is None:
+            raise KeyError(position)
+        return entity
+
+    def __setitem__(self, position, entity):
+        self.add(entity, position)
+
+    def __delitem__(self, position):
+        self.remove(self[position])
+
+    def __iter__(self):
+        return self.keys()
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(width={self.width}, height={self.height}, entities={len(self)})"
@@ -1,9 +1,36 @@
+from kelte.config import settings
 from kelte.ecs import System
+from kelte.maths import Position
 
 
 class Movement(System):
+    """Walks every mob one step toward the player along a shared flow
+    field, so the cost doesn't grow with the number of mobs"""
 
     queue_name = "movement"
 
-    def update(self, ticks=None):
-        pass
+    def __init__(self, name="movement", profile="walk", max_cost=None):
+        super().__init__(name)
+        self.profile = profile
+        self.max_cost = max_cost
+
+    def update(self, ticks=None, level=None, goals=None):
+        """Returns the (from, to) position of every mob that moved"""
+        level = settings.current_level if level is None else level
+        if goals is None:
+            position = settings.player.position
+            goals = [Position(position.x, position.y)]
+        field = level.flow_fields.get(goals, self.profile, self.max_cost)
+        moved = []
+        for position, entity in list(level.entities.items()):
+            if not entity.type.startswith("mob"):
+                continue
+            step = field.next_step(position)
+            if step == position or step in level.entities:
+                continue
+            level.entities.move(entity, step)
+            moved.append((position, step))
+        return moved
+
+    def __repr__(self):
+        return f"{type(self).__name__}(name={self.name}, profile={self.profile})"
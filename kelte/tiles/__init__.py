@@ -1 +1,2 @@
 from .api import *  # noqa
+from .grid import TileFlag, TileGrid, TileView, tile_dtype, tile_id
@@ -1,6 +1,5 @@
 from dataclasses import dataclass, field
 
-import colr
 import tcod as tdl
 
 from ..colors import Color, get_color
@@ -87,6 +86,8 @@ class Tile(metaclass=Registry):
 
     @property
     def rendered(self):
+        import colr  # only for printing tiles to a terminal; slow to import
+
         foreground = self.color.hex
         background = self.background_color.hex
         string = colr.color(self.c, fore=foreground, back=background)
@@ -0,0 +1,276 @@
+import enum
+import typing
+
+import numpy as np
+
+from ..colors import Color
+from .api import Tile, get_tile
+
+# Array-backed tile storage
+#   A cell is a tile-type id (shared definition from Tile.registry)
+#   plus a byte of per-cell state.  3 bytes per cell instead of a
+#   separate Tile dataclass per cell.
+
+
+class TileFlag(enum.IntFlag):
+    NONE = 0
+    WALKABLE = 1
+    OPAQUE = 2
+    LIT = 4
+    VISIBLE = 8
+    EXPLORED = 16
+
+
+tile_dtype = np.dtype([("id", np.uint16), ("flags", np.uint8)])
+
+# Tile flag attribute names, in bit order
+flag_names = {
+    "walkable": TileFlag.WALKABLE,
+    "opaque": TileFlag.OPAQUE,
+    "lit": TileFlag.LIT,
+    "visible": TileFlag.VISIBLE,
+    "explored": TileFlag.EXPLORED,
+}
+
+# Shared tile definition attribute names
+prototype_names = (
+    "name",
+    "character",
+    "destructable",
+    "flyable",
+    "lit_color",
+    "unlit_color",
+    "background_lit_color",
+    "background_unlit_color",
+    "background_mode",
+    "type",
+)
+
+# id 0 is reserved for "no tile"
+palette: typing.List[str] = [None]
+palette_ids: typing.Dict[str, int] = {}
+prototypes: typing.List[Tile] = [None]
+
+
+def tile_id(tile: typing.Union[str, Tile]) -> int:
+    """Returns the grid id for a tile (or tile name)"""
+    name = tile if isinstance(tile, str) else tile.name
+    value = palette_ids.get(name)
+    if value is None:
+        prototype = get_tile(name, copy=False)
+        value = len(palette)
+        palette.append(name)
+        palette_ids[name] = value
+        prototypes.append(prototype)
+    return value
+
+
+def tile_flags(tile: Tile) -> int:
+    """Packs the per-cell state of a tile into a bitfield"""
+    flags = TileFlag.NONE
+    for name, flag in flag_names.items():
+        if getattr(tile, name):
+            flags |= flag
+    return int(flags)
+
+
+def tile_prototype(value: int) -> Tile:
+    """Returns the shared tile definition for a grid id"""
+    return prototypes[value]
+
+
+_palette_arrays = {}
+
+
+def palette_array(attribute: str) -> np.ndarray:
+    """Returns a lookup table of `attribute` indexed by grid id
+
+    Color attributes become (n, 3) float rgb arrays, everything else
+    a 1-d array.  Tables are rebuilt when new tiles join the palette.
+    """
+    key = (attribute, len(palette))
+    table = _palette_arrays.get(key)
+    if table is None:
+        values = [getattr(tile, attribute) if tile is not None else None for tile in prototypes]
+        sample = next((v for v in values if v is not None), None)
+        if isinstance(sample, Color):
+            table = np.array([(v.r, v.g, v.b) if v is not None else (0.0, 0.0, 0.0) for v in values], dtype=np.float64)
+        elif isinstance(sample, str):
+            table = np.array([v if v is not None else " " for v in values])
+        else:
+            table = np.array([v if v is not None else 0 for v in values])
+        _palette_arrays[key] = table
+    return table
+
+
+class TileView:
+    """Lightweight stand-in for a Tile stored within a TileGrid
+
+    Per-cell state (walkable, opaque, lit, visible, explored) reads and
+    writes through to the grid; everything else comes from the shared
+    tile definition.
+    """
+
+    __slots__ = ("grid", "x", "y")
+
+    def __init__(self, grid: "TileGrid", x: int, y: int):
+        self.grid = grid
+        self.x = x
+        self.y = y
+
+    @property
+    def id(self) -> int:
+        return self.grid.ids.item(self.y, self.x)
+
+    @property
+    def flags(self) -> int:
+        return self.grid.flags.item(self.y, self.x)
+
+    @property
+    def prototype(self) -> Tile:
+        return prototypes[self.grid.ids.item(self.y, self.x)]
+
+    @property
+    def background_color(self):
+        if self.lit and self.visible:
+            return self.background_lit_color
+        else:
+            return self.background_unlit_color
+
+    @property
+    def color(self):
+        if self.lit and self.visible:
+            return self.lit_color
+        else:
+            return self.unlit_color
+
+    @property
+    def transparent(self):
+        return not self.opaque
+
+    @property
+    def rendered(self):
+        return self.copy().rendered
+
+    @property
+    def c(self):
+        if self.explored or self.visible:
+            return self.character
+        else:
+            return " "
+
+    def copy(self) -> Tile:
+        tile = self.prototype.copy()
+        flags = self.flags
+        for name, flag in flag_names.items():
+            setattr(tile, name, bool(flags & flag))
+        return tile
+
+    def _get_flag(self, flag):
+        return bool(self.grid.flags.item(self.y, self.x) & flag)
+
+    def _set_flag(self, flag, value):
+        if value:
+            self.grid.flags[self.y, self.x] |= flag
+        else:
+            self.grid.flags[self.y, self.x] &= ~flag & 0xFF
+
+    def __eq__(self, other):
+        if isinstance(other, TileView):
+            return self.id == other.id and self.flags == other.flags
+        elif isinstance(other, Tile):
+            return self.copy() == other
+        return NotImplemented
+
+    def __getattr__(self, item):
+        return getattr(self.prototype, item)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(name={self.name!r}, x={self.x}, y={self.y}, flags={TileFlag(self.flags)!r})"
+
+    def __str__(self):
+        return self.character
+
+
+def _flag_property(flag):
+    def getter(self):
+        return self._get_flag(flag)
+
+    def setter(self, value):
+        self._set_flag(flag, value)
+
+    return property(getter, setter)
+
+
+def _prototype_property(name):
+    def getter(self):
+        return getattr(self.prototype, name)
+
+    return property(getter)
+
+
+for _name, _flag in flag_names.items():
+    setattr(TileView, _name, _flag_property(_flag))
+
+for _name in prototype_names:
+    setattr(TileView, _name, _prototype_property(_name))
+
+
+class TileGrid:
+    """Structured array of tile ids and per-cell state bitfields"""
+
+    def __init__(self, width: int, height: int, fill: Tile = None):
+        self.width = width
+        self.height = height
+        self.data = np.zeros((height, width), dtype=tile_dtype)
+        self.ids = self.data["id"]
+        self.flags = self.data["flags"]
+        if fill is not None:
+            self.fill(fill)
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes
+
+    def fill(self, tile: Tile):
+        self.ids[...] = tile_id(tile)
+        self.flags[...] = tile_flags(tile)
+
+    def blit(self, xs, ys, tile: Tile):
+        """Writes a single tile to many cells at once"""
+        self.ids[ys, xs] = tile_id(tile)
+        self.flags[ys, xs] = tile_flags(tile)
+
+    def mask(self, flag: TileFlag) -> np.ndarray:
+        """Returns a boolean array for cells with `flag` set"""
+        return (self.flags & flag).astype(bool)
+
+    def set_mask(self, flag: TileFlag, mask: np.ndarray, value: bool = True):
+        """Sets (or clears) `flag` on every cell selected by `mask`"""
+        flags = self.flags
+        if value:
+            flags[mask] |= flag
+        else:
+            flags[mask] &= ~flag & 0xFF
+
+    def __getitem__(self, key) -> TileView:
+        x, y = key
+        return TileView(self, x, y)
+
+    def __setitem__(self, key, value: typing.Union[Tile, TileView]):
+        x, y = key
+        if isinstance(value, TileView):
+            self.data[y, x] = value.grid.data[value.y, value.x]
+        else:
+            self.data[y, x] = (tile_id(value), tile_flags(value))
+
+    def __iter__(self):
+        for y in range(self.height):
+            for x in range(self.width):
+                yield TileView(self, x, y)
+
+    def __len__(self):
+        return self.width * self.height
+
+    def __repr__(self):
+        return f"{type(self).__name__}(width={self.width}, height={self.height})"
@@ -7,11 +7,12 @@ import unicodedata
 from dataclasses import dataclass
 from pathlib import Path
 
-import freetype as ft
 import numpy as np
-from fontTools.ttLib import TTFont
-from fuzzywuzzy import fuzz
-from PIL import Image, ImageDraw, ImageFont
+
+# freetype, fontTools, fuzzywuzzy and PIL are only needed to build font
+# sheets, so they are imported where used and the game never loads them
+if typing.TYPE_CHECKING:  # pragma: no cover
+    import freetype as ft
 
 package_path = Path(__file__).parent.parent
 darwin = sys.platform == "darwin"
@@ -92,7 +93,7 @@ class Glyph:
     unicode: int
     char: str = None
     name: str = ""
-    slot: ft.Glyph = None
+    slot: "ft.Glyph" = None
     pixel_size: PixelSize = None
     bitmap: bytes = None
 
@@ -136,6 +137,8 @@ class Typeface:
     @property
     def face(self):
         if not hasattr(self, "_face"):
+            import freetype as ft
+
             try:
                 self._face = ft.Face(str(self.path))
             except ft.ft_errors.FT_Exception:
@@ -172,6 +175,8 @@ class Typeface:
 
     @property
     def ttf(self):
+        from fontTools.ttLib import TTFont
+
         typeface = TTFont(str(self.path))
         return typeface
 
@@ -227,6 +232,8 @@ class Typeface:
                 self.available = available
 
     def render(self, size=None, table_name=None, unicode_values=None, filepath=None):
+        from PIL import Image, ImageDraw, ImageFont
+
         typeface_size = size or 16
         assets_path = package_path / 'assets'
         fonts_path = assets_path / 'fonts'
@@ -297,6 +304,8 @@ class Typeface:
 
 
 def find_typeface(name):
+    from fuzzywuzzy import fuzz
+
     font_folders = [
         # package
         Path(".").absolute(),
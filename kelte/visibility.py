@@ -0,0 +1,48 @@
+import typing
+
+import numpy as np
+
+# Visibility cache
+#   Remembers the last frame's mask (or intensity map) for each source
+#   so that a new frame only reports the cells that actually changed.
+
+
+class VisibilityCache:
+    def __init__(self):
+        self.frames: typing.Dict[typing.Hashable, np.ndarray] = {}
+
+    def get(self, source: typing.Hashable) -> typing.Union[np.ndarray, None]:
+        return self.frames.get(source)
+
+    def update(self, source: typing.Hashable, frame: np.ndarray) -> np.ndarray:
+        """Stores `frame` for `source` and returns a boolean mask of the
+        cells that differ from the previous frame
+
+        For boolean masks this is the XOR of the two frames.
+        """
+        previous = self.frames.get(source)
+        self.frames[source] = frame
+        if previous is None:
+            return frame.astype(bool)
+        return frame != previous
+
+    def forget(self, source: typing.Hashable) -> typing.Union[np.ndarray, None]:
+        """Drops the cached frame for `source`; returns the cells it covered"""
+        previous = self.frames.pop(source, None)
+        if previous is not None:
+            return previous.astype(bool)
+
+    def clear(self):
+        self.frames.clear()
+
+    def __contains__(self, source):
+        return source in self.frames
+
+    def __len__(self):
+        return len(self.frames)
+
+
+def dirty_cells(changed: np.ndarray) -> typing.Iterator[typing.Tuple[int, int]]:
+    """Yields (x, y) for every changed cell"""
+    ys, xs = np.nonzero(changed)
+    yield from zip(xs.tolist(), ys.tolist())
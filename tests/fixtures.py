@@ -1 +1,16 @@
 # TODO: Add fixtures here as needed.
+import pytest
+
+
+@pytest.fixture(scope="session")
+def game_data():
+    from kelte.initialization import find_data
+    from kelte.items import populate_item_data
+    from kelte.mobs import populate_mob_data
+    from kelte.tiles import populate_tile_data
+
+    data = find_data()
+    populate_tile_data(data)
+    populate_mob_data(data)
+    populate_item_data(data)
+    return data
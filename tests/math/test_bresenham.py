@@ -67,3 +67,39 @@ def test_bresenham(data):
     expected = data.get('expected')
 
     assert list(bresenham(start, end)) == expected
+
+
+@pytest.mark.parametrize('data', [
+    {'delta': (0, 0)},
+    {'delta': (5, 2)},
+    {'delta': (-3, 7)},
+    {'delta': (-6, -6)},
+    ])
+def test_ray_offsets(data):
+    from kelte.maths.bresenham import bresenham, ray_offsets
+
+    dx, dy = data['delta']
+    offsets = ray_offsets(dx, dy)
+
+    assert offsets.dtype.name == 'int16'
+    assert list(map(tuple, offsets.tolist())) == list(bresenham((0, 0), (dx, dy)))
+    assert ray_offsets(dx, dy) is offsets
+    assert not offsets.flags.writeable
+
+
+def test_rays():
+    from kelte.maths.bresenham import bresenham, ray_mask, rays
+
+    origin = (2, 3)
+    targets = [(2, 3), (6, 3), (0, 0), (9, 4)]
+    points, lengths = rays(origin, targets)
+
+    assert points.shape == (4, 8, 2)
+    for ray, length, target in zip(points.tolist(), lengths.tolist(), targets):
+        expected = list(bresenham(origin, target))
+        assert length == len(expected)
+        assert list(map(tuple, ray[:length])) == expected
+        assert all(tuple(point) == target for point in ray[length:])
+
+    mask = ray_mask(points, lengths, width=8, height=8)
+    assert mask.sum(axis=1).tolist() == [1, 5, 4, 6]
@@ -39,3 +39,44 @@ def test_euclidean_distance(data):
     data = munch.Munch(data)
 
     assert euclidean_distance(*data.points, strict=data.strict) == data.expected
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"points": [(0, 0), (3, 4)], "expected": {"euclidean": 5.0, "chebyshev": 4, "manhattan": 7, "octile": 3 * 2 ** 0.5 + 1}},
+        {"points": [(2, -1), (2, -1)], "expected": {"euclidean": 0.0, "chebyshev": 0, "manhattan": 0, "octile": 0.0}},
+        {"points": [(-2, 5), (1, 2)], "expected": {"euclidean": 18 ** 0.5, "chebyshev": 3, "manhattan": 6, "octile": 3 * 2 ** 0.5}},
+    ],
+)
+def test_distance_metrics(data):
+    import numpy as np
+
+    from kelte.maths import distance
+
+    start, end = data["points"]
+    for metric, expected in data["expected"].items():
+        scalar = getattr(distance, f"{metric}_distance")(start, end)
+        assert scalar == pytest.approx(expected)
+        assert distance.metrics[metric](np.array([start, end]), end).tolist() == pytest.approx([expected, 0])
+        table = distance.pairwise([start, end], [end, start], metric)
+        assert np.allclose(table, [[expected, 0], [0, expected]])
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"center": (0, 0), "radius": 2, "metric": "euclidean", "expected": [0, 1, 2]},
+        {"center": (0, 0), "radius": 2, "metric": "chebyshev", "expected": [0, 1, 2, 3]},
+        {"center": (0, 0), "radius": 2, "metric": "manhattan", "expected": [0, 1, 2]},
+        {"center": (5, 5), "radius": 1, "metric": "octile", "expected": []},
+    ],
+)
+def test_distance_within(data):
+    from kelte.maths import PositionArray
+    from kelte.maths.distance import within
+
+    points = PositionArray([(0, 0), (2, 0), (1, 1), (2, 2), (3, 0)])
+    found = within(points, data["center"], data["radius"], data["metric"])
+    assert found.tolist() == data["expected"]
+    assert points.within(data["center"], data["radius"], data["metric"]) == points[found]
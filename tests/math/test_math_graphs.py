@@ -0,0 +1,110 @@
+import pytest
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {  # path 0-1-2-3 and a separate pair 4-5
+            "count": 6,
+            "edges": [(0, 1), (1, 2), (2, 3), (4, 5)],
+            "start": 0,
+            "depths": [0, 1, 2, 3, -1, -1],
+            "components": [0, 0, 0, 0, 1, 1],
+        },
+        {  # cycle with a chord
+            "count": 5,
+            "edges": [(0, 1), (1, 2), (2, 3), (3, 4), (4, 0), (0, 2)],
+            "start": 3,
+            "depths": [2, 2, 1, 0, 1],
+            "components": [0, 0, 0, 0, 0],
+        },
+        {"count": 3, "edges": [], "start": 1, "depths": [-1, 0, -1], "components": [0, 1, 2]},
+    ],
+)
+def test_csr_graph_traversal(data):
+    from kelte.maths import CSRGraph
+
+    sources = [start for start, _ in data["edges"]]
+    targets = [end for _, end in data["edges"]]
+    graph = CSRGraph.from_edges(data["count"], sources, targets)
+
+    assert len(graph) == data["count"]
+    assert graph.edge_count == 2 * len(data["edges"])
+    assert graph.bfs(data["start"]).tolist() == data["depths"]
+    count, components = graph.connected_components()
+    assert count == max(data["components"]) + 1
+    assert components.tolist() == data["components"]
+
+    expected = [node for node, depth in enumerate(data["depths"]) if 0 < depth <= 1]
+    assert sorted(graph.in_range(data["start"], 1).tolist()) == expected
+
+
+def test_csr_graph_from_grid():
+    import numpy as np
+
+    from kelte.maths import CSRGraph, Position
+    from kelte.maths.pathing import breadth_first
+
+    walkable = np.array(
+        [
+            [1, 1, 0, 1],
+            [1, 0, 0, 1],
+            [1, 1, 0, 0],
+        ],
+        dtype=bool,
+    )
+    graph = CSRGraph.from_grid(walkable)
+    assert len(graph) == walkable.sum()
+    assert graph.labels[0] == Position(0, 0)
+
+    start = graph.node((0, 0))
+    depths = graph.bfs(start)
+    expected = breadth_first(walkable, Position(0, 0))
+    for node, position in enumerate(graph.labels):
+        assert depths[node] == expected[position.y, position.x]
+
+    count, components = graph.connected_components()
+    assert count == 2
+    assert components[graph.node(Position(3, 1))] == components[graph.node(Position(3, 0))]
+
+    orthogonal = CSRGraph.from_grid(walkable, diagonal=False)
+    assert orthogonal.edge_count < graph.edge_count
+    assert set(graph.edge_weights(graph.node((0, 1))).tolist()) == {1.0, 2 ** 0.5}
+
+
+def test_csr_graph_from_rooms():
+    from kelte.maths import CSRGraph, Position
+
+    class Room:
+        def __init__(self, x, y):
+            self.center = Position(x, y)
+
+        __hash__ = None
+
+    class Cooridor:
+        def __init__(self, start, end):
+            self.start_room, self.end_room = start, end
+
+    rooms = [Room(0, 0), Room(3, 4), Room(10, 0), Room(20, 20)]
+    cooridors = [Cooridor(rooms[0], rooms[1]), Cooridor(rooms[1], rooms[2]), Cooridor(rooms[3], rooms[3])]
+    graph = CSRGraph.from_rooms(rooms, cooridors)
+
+    assert graph.node(rooms[2]) == 2
+    assert graph.neighbors(1).tolist() == [2, 0]
+    assert graph.edge_weights(0).tolist() == [5.0]
+    assert graph.connected_components()[1].tolist() == [0, 0, 0, 1]
+
+
+def test_node_graph_neighbors():
+    from kelte.maths.graphs import Node
+
+    a, b, c, d = (Node(identifier=(i,)) for i in range(4))
+    a.connect(b, directed=False)
+    b.connect(c, directed=False)
+    c.connect(d, directed=False)
+    c.connect(a, directed=False)
+
+    assert len(a.edges) == 2
+    assert [node.identifier for node in a.neighbors_in_range(1)] == [(1,), (2,)]
+    assert [node.identifier for node in a.neighbors_in_range(3)] == [(1,), (2,), (3,)]
+    assert list(a.neighbors_in_range(0)) == []
@@ -0,0 +1,62 @@
+import pytest
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"seed": 1, "octaves": 1, "period": None},
+        {"seed": 2, "octaves": 3, "period": None},
+        {"seed": 3, "octaves": 4, "period": 4},
+    ],
+)
+def test_noise_chunks_match_window(data):
+    import numpy as np
+
+    from kelte.maths import Noise
+
+    noise = Noise(seed=data["seed"], octaves=data["octaves"], period=data["period"], block=7)
+    full = noise.window(-13, 4, 90, 45)
+    assert full.dtype == np.float32
+    assert full.shape == (45, 90)
+    assert np.abs(full).max() <= 1.0
+    assert full.std() > 0
+
+    chunks = np.zeros_like(full)
+    for x in range(0, 90, 32):
+        for y in range(0, 45, 20):
+            window = chunks[y:y + 20, x:x + 32]
+            assert noise.window(-13 + x, 4 + y, *window.shape[::-1], out=window) is window
+    assert np.array_equal(full, chunks)
+
+    same = Noise(seed=data["seed"], octaves=data["octaves"], period=data["period"])
+    assert np.array_equal(same.window(-13, 4, 90, 45), full)
+
+
+def test_noise_tiles():
+    import numpy as np
+
+    from kelte.maths import Noise
+
+    noise = Noise(seed=5, scale=0.25, octaves=2, period=4)  # repeats every 16 cells
+    tile = noise.window(0, 0, 16, 16)
+    assert np.allclose(noise.window(16, 0, 16, 16), tile, atol=1e-6)
+    assert np.allclose(noise.window(-16, 32, 16, 16), tile, atol=1e-6)
+    assert not np.allclose(noise.window(8, 0, 16, 16), tile)
+
+    with pytest.raises(ValueError):
+        noise.window(0, 0, 4, 4, out=np.empty((3, 4), dtype=np.float32))
+
+
+def test_perlin_leaves_global_state():
+    import numpy as np
+
+    from kelte.maths import perlin
+
+    np.random.seed(10)
+    expected = np.random.random()
+    np.random.seed(10)
+    values = perlin(samples=20, seed=4)
+    assert np.random.random() == expected
+    assert values.shape == (20, 20)
+    assert values.dtype == np.float64
+    assert np.array_equal(values, perlin(samples=20, seed=4))
@@ -0,0 +1,89 @@
+import pytest
+
+# '#' is blocked, 'S' start, 'E' end
+maps = {
+    "open": [
+        "S....",
+        ".....",
+        "....E",
+    ],
+    "wall": [
+        "S.#..",
+        "..#..",
+        "..#.E",
+        ".....",
+    ],
+    "blocked": [
+        "S.#..",
+        "..#.E",
+        "..#..",
+    ],
+}
+
+
+def parse(rows):
+    import numpy as np
+
+    walkable = np.array([[c != "#" for c in row] for row in rows])
+    cells = {c: (x, y) for y, row in enumerate(rows) for x, c in enumerate(row)}
+    return walkable, cells["S"], cells["E"]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"map": "open", "steps": 4, "cost": 2 + 2 * 2 ** 0.5},
+        {"map": "wall", "steps": 5, "cost": 2 + 3 * 2 ** 0.5},
+        {"map": "blocked", "steps": 0, "cost": None},
+    ],
+)
+def test_a_star(data):
+    from kelte.maths import Position
+    from kelte.maths.pathing import a_star, dijkstra_map
+
+    walkable, start, end = parse(maps[data["map"]])
+    path = a_star(walkable, Position(*start), Position(*end))
+
+    assert len(path) == data["steps"]
+    if path:
+        assert path[-1] == end
+        previous = start
+        for step in path:
+            assert walkable[step.y, step.x]
+            assert max(abs(step.x - previous[0]), abs(step.y - previous[1])) == 1
+            previous = step
+
+    costs = dijkstra_map(walkable, [Position(*end)])
+    if data["cost"] is None:
+        assert costs[start[1], start[0]] == float("inf")
+    else:
+        assert costs[start[1], start[0]] == pytest.approx(data["cost"])
+
+
+def test_descend():
+    from kelte.maths import Position
+    from kelte.maths.pathing import descend, dijkstra_map
+
+    walkable, start, end = parse(maps["wall"])
+    costs = dijkstra_map(walkable, [Position(*end)])
+    position, steps = Position(*start), 0
+    while position != end:
+        position = descend(costs, position)
+        steps += 1
+    assert steps == 5
+    assert descend(costs, position) == end
+
+    step = descend(costs, tuple(start))
+    assert type(step) is Position
+    assert step == descend(costs, Position(*start))
+
+
+def test_breadth_first():
+    from kelte.maths import Position
+    from kelte.maths.pathing import breadth_first
+
+    walkable, start, end = parse(maps["wall"])
+    distances = breadth_first(walkable, Position(*start))
+    assert distances[end[1], end[0]] == 5
+    assert distances[0, 2] == -1
+    assert breadth_first(walkable, Position(*start), max_distance=2).max() == 2
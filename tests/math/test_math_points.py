@@ -54,3 +54,152 @@ def test_position_distance(point01, point02, distance):
 
     assert p.distance(point02) == distance
     assert p.distance(Position(*point02)) == distance
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"a": (1, 2), "b": (3, -4), "sum": (4, -2), "difference": (-2, 6), "product": (3, -8)},
+        {"a": (0, 0), "b": (0, 0), "sum": (0, 0), "difference": (0, 0), "product": (0, 0)},
+        {"a": (500, 1), "b": (-500, 2), "sum": (0, 3), "difference": (1000, -1), "product": (-250000, 2)},
+    ],
+)
+def test_position_arithmetic(data):
+    from kelte.maths import Direction, Position
+
+    a, b = Position(*data["a"]), Position(*data["b"])
+    assert a + b == data["sum"]
+    assert a + data["b"] == data["sum"]
+    assert a - b == data["difference"]
+    assert a * data["b"] == data["product"]
+    assert isinstance(a + Direction(*data["b"]), Position)
+    # a plain tuple on the left must not concatenate
+    assert data["b"] + a == data["sum"]
+    assert data["b"] - a == tuple(-value for value in data["difference"])
+    assert data["b"] * a == data["product"]
+    assert 2 * a == a * 2 == (data["a"][0] * 2, data["a"][1] * 2)
+    assert hash(a) == hash(data["a"])
+    assert {a: 1}[data["a"]] == 1
+    assert a[0] == a["x"] == data["a"][0]
+
+
+def test_position_immutable():
+    import copy
+
+    from kelte.maths import Position
+
+    p = Position(3, 4)
+    assert copy.copy(p) is p
+    assert copy.deepcopy(p) == p
+    with pytest.raises(AttributeError):
+        p.x = 1
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"args": (3.0, 2), "expected": (3, 2)},
+        {"args": (3.7, 2), "expected": (3, 2)},
+        {"args": (300.5, 2), "expected": (300, 2)},
+        {"args": (-20.0, 1000.9), "expected": (-20, 1000)},
+    ],
+)
+def test_position_float_coordinates(data):
+    from kelte.maths import Position
+
+    p = Position(*data["args"])
+    assert p == data["expected"]
+    assert all(type(value) is int for value in p)
+
+
+def legacy_classes():
+    # Position and Direction before they were slotted
+    from dataclasses import dataclass
+
+    from kelte.maths import Point
+
+    @dataclass
+    class LegacyPosition(Point):
+        x: int = 0
+        y: int = 0
+
+        def __hash__(self):
+            return hash((self.x, self.y))
+
+        def __getitem__(self, item):
+            data = tuple(self)
+            if isinstance(item, int):
+                return data[item]
+            elif isinstance(item, str):
+                return self.__dict__[item]
+
+        def __iter__(self):
+            yield self.x
+            yield self.y
+
+    @dataclass
+    class LegacyDirection(Point):
+        x: int = 0
+        y: int = 0
+
+    return LegacyPosition, LegacyDirection
+
+
+def best_of(func, repeat=5):
+    import time
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+@pytest.mark.slow
+def test_position_benchmark(monkeypatch):
+    import kelte.procgen.api as procgen_api
+    import kelte.procgen.levels as levels
+    from kelte.maths import Position, vector
+    from kelte.procgen import Level, Room
+    from kelte.tiles import get_tile
+
+    LegacyPosition, LegacyDirection = legacy_classes()
+    get_tile("wall", opaque=True)
+    get_tile("floor", walkable=True)
+    get_tile("closed door")
+    get_tile("hidden door")
+    rooms = [Room(position=Position(x, y), width=12, height=8) for x in range(1, 70, 15) for y in range(1, 35, 10)]
+    level = Level(80, 43, rooms=rooms)
+    directions = ["UP", "DOWN", "LEFT", "RIGHT", "UP_LEFT", "UP_RIGHT", "DOWN_LEFT", "DOWN_RIGHT"]
+
+    def ray():
+        for y in range(0, 43, 3):
+            list(position(0, 0).ray((79, y)))
+
+    def doors():
+        for cell, tile in level:
+            procgen_api.create_door(position(cell.x, cell.y), tile, level)
+
+    def iterate():
+        list(level)
+
+    monkeypatch.setattr(procgen_api.terminal, "echo", lambda *args, **kwds: None)
+    timings = {}
+    for name, position, direction in [("legacy", LegacyPosition, LegacyDirection), ("slotted", Position, vector.Direction)]:
+        monkeypatch.setattr(levels, "Position", position)
+        for attribute in directions:
+            value = getattr(vector, attribute)
+            monkeypatch.setattr(procgen_api, attribute, direction(value.x, value.y))
+        timings[name] = {"Point.ray": best_of(ray), "create_door": best_of(doors), "Level.__iter__": best_of(iterate)}
+
+    print()
+    for benchmark, legacy in timings["legacy"].items():
+        slotted = timings["slotted"][benchmark]
+        print(f"{benchmark}: {legacy * 1000:.2f}ms -> {slotted * 1000:.2f}ms ({legacy / slotted:.1f}x)")
+
+    # single microbenchmarks are too noisy to gate on; only the total is
+    # held, with some slack for timer jitter
+    legacy = sum(timings["legacy"].values())
+    slotted = sum(timings["slotted"].values())
+    assert slotted < legacy * 1.2
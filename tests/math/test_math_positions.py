@@ -0,0 +1,95 @@
+import pytest
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"points": [(0, 0), (3, 4), (-1, 2)], "offset": (1, 1), "expected": [(1, 1), (4, 5), (0, 3)]},
+        {"points": [(5, 5)], "offset": (-5, 0), "expected": [(0, 5)]},
+        {"points": [], "offset": (1, 1), "expected": []},
+    ],
+)
+def test_position_array_math(data):
+    from kelte.maths import Position, PositionArray
+
+    points = PositionArray(data["points"])
+    moved = points + Position(*data["offset"])
+
+    assert len(moved) == len(data["expected"])
+    assert list(moved) == data["expected"]
+    assert all(isinstance(point, Position) for point in moved)
+    assert (moved - data["offset"]) == points
+    assert moved.distance(moved).tolist() == [0.0] * len(data["expected"])
+
+
+def test_position_array_bounds():
+    from kelte.maths import Position, PositionArray
+
+    points = PositionArray([(-1, 0), (2, 2), (5, 1), (3, 9)])
+
+    assert points.inside(4, 4).tolist() == [False, True, False, False]
+    assert points.crop(4, 4).tolist() == [(2, 2)]
+    assert points.clip(4, 4).tolist() == [(0, 0), (2, 2), (3, 1), (3, 3)]
+    assert points.distance(Position(2, 2))[1] == 0
+    assert points.distance((2, 1))[2] == 3.0
+
+
+def test_position_array_membership():
+    from kelte.maths import Position, PositionArray
+
+    points = PositionArray.from_rect(1, 1, 4, 3)
+    assert points.tolist()[:4] == [(1, 1), (2, 1), (3, 1), (1, 2)]
+    assert Position(3, 2) in points
+    assert (0, 0) not in points
+    assert points.isin([(3, 2), (1, 1), (-5, 7)]).tolist() == [True, False, False, False, False, True]
+    assert points.index(Position(2, 2)) == 4
+    assert points.pop(4) == (2, 2)
+    assert len(points) == 5
+    with pytest.raises(ValueError):
+        points.index((2, 2))
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"width": 5, "points": [(0, 0), (4, 0), (0, 1), (3, 2)], "flat": [0, 4, 5, 13]},
+        {"width": 1, "points": [(0, 3)], "flat": [3]},
+    ],
+)
+def test_position_array_flat(data):
+    import numpy as np
+
+    from kelte.maths import PositionArray
+
+    points = PositionArray(data["points"])
+    assert points.to_flat(data["width"]).tolist() == data["flat"]
+    assert PositionArray.from_flat(data["flat"], data["width"]) == points
+
+    mask = np.zeros(20, dtype=bool)
+    mask[data["flat"]] = True
+    assert PositionArray.from_mask(mask.reshape(-1, data["width"])) == points
+
+
+def test_position_array_conversion():
+    import warnings
+
+    import numpy as np
+
+    from kelte.maths import PositionArray
+
+    points = PositionArray([(1, 2), (3, 4)])
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        copied = np.array(points, copy=True)
+        shared = np.asarray(points)
+    copied[0, 0] = 9
+    assert points[0] == (1, 2)
+    assert not shared.flags.writeable
+    with pytest.raises(ValueError):
+        shared[0, 0] = 9
+
+    assert not np.shares_memory(points.__array__(copy=True), points.array)
+    assert np.shares_memory(points.__array__(copy=False), points.array)
+    assert points.__array__(np.float64).dtype == np.float64
+    with pytest.raises(ValueError):
+        points.__array__(np.float64, copy=False)
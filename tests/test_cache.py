@@ -0,0 +1,40 @@
+import pytest
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"other": ("42", 40, 30, 2)},
+        {"other": (7, 41, 30, 2)},
+        {"other": (7, 40, 31, 2)},
+        {"other": (7, 40, 30, 3)},
+    ],
+)
+def test_cache_key(data):
+    from kelte.procgen.cache import GENERATOR_VERSION, cache_key
+
+    key = cache_key(7, 40, 30, 2)
+    assert key == cache_key(7, 40, 30, 2)
+    assert key != cache_key(*data["other"])
+    assert key != cache_key(7, 40, 30, 2, version=GENERATOR_VERSION + 1)
+
+
+def test_baked_dungeon_matches_lazy(game_data, tmp_path):
+    from kelte.procgen import LazyDungeon
+    from kelte.procgen.cache import DungeonCache
+
+    cache = DungeonCache(tmp_path)
+    assert cache.get(7, 40, 30, 2) is None
+
+    path = cache.bake(7, 40, 30, 2)
+    assert (7, 40, 30, 2) in cache
+    assert list(cache) == [path]
+    modified = path.stat().st_mtime_ns
+    assert cache.bake(7, 40, 30, 2) == path
+    assert path.stat().st_mtime_ns == modified
+
+    baked = cache.get(7, 40, 30, 2)
+    lazy = LazyDungeon(2, 40, 30, seed=7, processes=0)
+    for level, expected in zip(baked, lazy):
+        assert level.grid.data.tobytes() == expected.grid.data.tobytes()
+        assert str(level) == str(expected)
@@ -0,0 +1,55 @@
+import pytest
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"points": [(0, 0), (10, 0), (0, 3), (11, 1)], "expected": 3 + 10 + 2 ** 0.5},
+        {"points": [(0, 0), (5, 5)], "expected": 50 ** 0.5},
+        {"points": [(4, 4)], "expected": 0},
+    ],
+)
+def test_minimum_spanning_tree(data):
+    from kelte.maths.distance import pairwise
+    from kelte.procgen.connectivity import minimum_spanning_tree
+
+    distances = pairwise(data["points"], data["points"])
+    edges = minimum_spanning_tree(distances)
+    assert len(edges) == len(data["points"]) - 1
+    assert sum(distances[i, j] for i, j in edges) == pytest.approx(data["expected"])
+    assert {node for edge in edges for node in edge} == (set(range(len(data["points"]))) if edges else set())
+
+
+def test_nearest_neighbors():
+    import numpy as np
+
+    from kelte.maths.distance import pairwise
+    from kelte.procgen.connectivity import nearest_neighbors
+
+    points = np.array([(0, 0), (1, 0), (5, 0), (6, 0)])
+    edges = nearest_neighbors(pairwise(points, points), 1)
+    assert edges == [(0, 1), (2, 3)]
+    assert len(nearest_neighbors(pairwise(points, points), 10)) == 6
+
+
+@pytest.mark.parametrize("data", [{"seed": 1, "loops": 0.0}, {"seed": 2, "loops": 0.25}])
+def test_mst_connected_levels(data, game_data):
+    import random
+
+    from kelte.maths import CSRGraph
+    from kelte.procgen import create_level
+
+    random.seed(data["seed"])
+    chain = create_level(120, 90, density=0.3, margin=1)
+    random.seed(data["seed"])
+    level = create_level(120, 90, density=0.3, margin=1, connectivity="mst", loops=data["loops"])
+
+    rooms = len(level.rooms)
+    assert rooms == len(chain.rooms)
+    assert len(level.cooridors) == rooms - 1 + round(data["loops"] * rooms)
+    count, _ = CSRGraph.from_rooms(level.rooms, level.cooridors).connected_components()
+    assert count == 1
+    assert sum(map(len, level.cooridors)) < sum(map(len, chain.cooridors))
+
+    with pytest.raises(ValueError):
+        create_level(60, 40, connectivity="spiral")
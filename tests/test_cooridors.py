@@ -0,0 +1,67 @@
+import pytest
+
+
+def _room(x, y, width, height):
+    from kelte.maths import Position
+    from kelte.procgen import Room
+
+    return Room(width=width, height=height, position=Position(x, y))
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"horizontal_first": 1, "corner": (22, 5), "start_door": (9, 5), "end_door": (22, 16)},
+        {"horizontal_first": 0, "corner": (5, 21), "start_door": (5, 9), "end_door": (17, 21)},
+    ],
+)
+def test_l_cooridor(data, game_data, monkeypatch):
+    import random
+
+    from kelte.maths import Position
+    from kelte.procgen import Cooridor
+
+    monkeypatch.setattr(random, "randint", lambda a, b: data["horizontal_first"])
+    start, end = _room(2, 2, 7, 7), _room(18, 17, 9, 9)
+    cooridor = Cooridor(start, end)
+
+    positions = cooridor.positions
+    assert len(cooridor) == len(positions) == (22 - 5 + 1) + (21 - 5 + 1)
+    assert Position(*data["corner"]) in positions
+    assert positions[0] == Position(5, 5)
+    assert start.doors == [Position(*data["start_door"])]
+    assert end.doors == [Position(*data["end_door"])]
+    assert [position for position, _ in cooridor] == positions.tolist()
+    assert {tile.name for _, tile in cooridor} == {"floor"}
+
+
+@pytest.mark.parametrize("data", [{"style": "straight"}, {"style": "jitter"}])
+def test_cooridor_styles(data, game_data):
+    import random
+
+    import numpy as np
+
+    from kelte.procgen import Cooridor
+    from kelte.tiles import TileGrid, get_tile, tile_id
+
+    random.seed(1)
+    start, end = _room(2, 2, 7, 7), _room(30, 20, 9, 9)
+    cooridor = Cooridor(start, end, style=data["style"])
+    cells = np.array(cooridor.positions)
+
+    assert tuple(cells[0]) == tuple(start.center)
+    assert tuple(cells[-1]) == tuple(end.center)
+    steps = np.abs(np.diff(cells, axis=0))
+    assert steps.max() == 1
+    if data["style"] == "jitter":
+        assert (steps.sum(axis=1) == 1).all()  # orthogonal steps only
+        assert len(cells) == 1 + (34 - 5) + (24 - 5)
+    assert len(start.doors) == len(end.doors) == 1
+
+    grid = TileGrid(40, 30, fill=get_tile("wall", copy=False))
+    cooridor.carve(grid)
+    assert (grid.ids[cells[:, 1], cells[:, 0]] == tile_id("floor")).all()
+    assert (grid.ids == tile_id("floor")).sum() == len(set(map(tuple, cells.tolist())))
+
+    with pytest.raises(ValueError):
+        Cooridor(start, end, style="zigzag")
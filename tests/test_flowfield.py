@@ -0,0 +1,145 @@
+import pytest
+
+
+def _walkable(rows):
+    import numpy as np
+
+    return np.array([[cell == "." for cell in row] for row in rows])
+
+
+ROWS = [
+    "..........",
+    ".######...",
+    "......#...",
+    ".####.#.#.",
+    ".#....#.#.",
+    ".#.####.#.",
+    "..........",
+]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"goals": [(0, 0)], "max_cost": None},
+        {"goals": [(9, 6), (2, 4)], "max_cost": None},
+        {"goals": [(5, 2)], "max_cost": 6},
+    ],
+)
+def test_flow_field_matches_dijkstra(data):
+    import numpy as np
+
+    from kelte.flowfield import FlowField
+    from kelte.maths import Position
+    from kelte.maths.pathing import dijkstra_map
+
+    walkable = _walkable(ROWS)
+    goals = [Position(*goal) for goal in data["goals"]]
+    field = FlowField(walkable, goals, max_cost=data["max_cost"])
+    expected = dijkstra_map(walkable, goals, data["max_cost"])
+    assert np.allclose(field.cost_map, expected, equal_nan=True)
+
+    # following next_step from anywhere reachable walks downhill to a goal
+    for y, x in np.argwhere(np.isfinite(expected)):
+        position = Position(int(x), int(y))
+        for _ in range(walkable.size):
+            step = field.next_step(position)
+            if step == position:
+                break
+            assert walkable[step.y, step.x]
+            assert field.cost(step) < field.cost(position)
+            position = step
+        assert position in goals
+
+    # plain (x, y) tuples are accepted like everywhere else
+    for y in range(walkable.shape[0]):
+        for x in range(walkable.shape[1]):
+            step = field.next_step((x, y))
+            assert type(step) is Position
+            assert step == field.next_step(Position(x, y))
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"changes": [((7, 3), False)]},
+        {"changes": [((6, 2), False), ((2, 6), False)]},
+        {"changes": [((6, 4), True), ((1, 1), True)]},
+        {"changes": [((0, 0), False), ((4, 1), True), ((7, 6), False)]},
+    ],
+)
+def test_flow_field_repair(data):
+    import numpy as np
+
+    from kelte.flowfield import FlowField
+    from kelte.maths import Position
+
+    walkable = _walkable(ROWS)
+    goals = [Position(0, 0), Position(9, 3)]
+    field = FlowField(walkable, goals)
+    for (x, y), value in data["changes"]:
+        walkable[y, x] = value
+
+    assert field.update(walkable)
+    assert not field.update(walkable)
+    assert field.repairs == 1
+    fresh = FlowField(walkable, goals)
+    assert np.allclose(field.cost_map, fresh.cost_map)
+    assert field._directions == fresh._directions
+
+
+def test_flow_fields_are_shared():
+    from kelte.flowfield import FlowFields
+    from kelte.maths import Position
+
+    class Level:
+        walkability = _walkable(ROWS)
+
+    level = Level()
+    fields = FlowFields(level, size=2)
+    field = fields.get([Position(0, 0)])
+    assert fields.get([(0, 0)]) is field
+    assert field.next_step(Position(1, 0)) == Position(0, 0)
+
+    level.walkability = level.walkability.copy()
+    level.walkability[0, 1] = False
+    assert fields.get([Position(0, 0)]) is field
+    assert field.repairs == 1
+    assert field.next_step(Position(2, 0)) == Position(3, 0)  # the long way round
+    assert field.cost(Position(2, 0)) > 2
+
+    fields.get([Position(9, 6)])
+    fields.get([Position(9, 0)])
+    assert len(fields) == 2
+    assert fields.get([Position(0, 0)]) is not field
+
+
+def test_movement_system():
+    from kelte.ecs import Entity
+    from kelte.flowfield import FlowFields
+    from kelte.maths import Position
+    from kelte.spatial import EntityIndex
+    from kelte.systems.movement import Movement
+
+    class Level:
+        walkability = _walkable(ROWS)
+
+    level = Level()
+    level.flow_fields = FlowFields(level)
+    level.entities = EntityIndex(10, 7)
+    rat = Entity(name="rat", type="mob")
+    bat = Entity(name="bat", type="mob")
+    chest = Entity(name="chest", type="item")
+    level.entities.add(rat, Position(3, 0))
+    level.entities.add(bat, Position(2, 0))
+    level.entities.add(chest, Position(5, 0))
+
+    moved = Movement().update(level=level, goals=[Position(0, 0)])
+    assert moved == [(Position(2, 0), Position(1, 0))]
+    assert level.entities.get(Position(1, 0)) is bat
+    assert level.entities.get(Position(3, 0)) is rat
+    assert level.entities.position_of(chest) == Position(5, 0)
+
+    Movement().update(level=level, goals=[Position(0, 0)])
+    assert bat.position == Position(0, 0)
+    assert rat.position == Position(2, 0)
@@ -0,0 +1,91 @@
+import time
+
+import pytest
+
+
+def open_room(width, height, walls=()):
+    import numpy as np
+
+    transparency = np.ones((height, width), dtype=bool)
+    for x, y in walls:
+        transparency[y, x] = False
+    return transparency
+
+
+@pytest.mark.parametrize("engine", ["shadowcasting", "permissive"])
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"walls": [], "hidden": [], "seen": [(0, 0), (10, 10), (10, 0)]},
+        {"walls": [(7, 5)], "hidden": [(8, 5), (9, 5), (10, 5)], "seen": [(7, 5), (6, 5)]},
+        {"walls": [(x, 4) for x in range(11)], "hidden": [(5, 3), (0, 0)], "seen": [(5, 4), (5, 10)]},
+    ],
+)
+def test_compute_fov(engine, data):
+    from kelte.fov import compute_fov
+
+    transparency = open_room(11, 11, data["walls"])
+    visible = compute_fov(transparency, (5, 5), engine=engine)
+
+    assert visible.shape == transparency.shape
+    assert visible[5, 5]
+    for x, y in data["hidden"]:
+        assert not visible[y, x]
+    for x, y in data["seen"]:
+        assert visible[y, x]
+
+
+def test_compute_fov_radius():
+    from kelte.fov import compute_fov
+
+    visible = compute_fov(open_room(11, 11), (5, 5), radius=2)
+    assert visible.sum() == 13
+    assert not visible[5, 8]
+
+
+def test_permissive_fov_superset():
+    import numpy as np
+
+    from kelte.fov import compute_fov
+
+    random = np.random.RandomState(0)
+    for _ in range(20):
+        transparency = random.rand(25, 25) > 0.3
+        transparency[12, 12] = True
+        strict = compute_fov(transparency, (12, 12))
+        permissive = compute_fov(transparency, (12, 12), engine="permissive")
+        assert (permissive | ~strict).all()
+
+
+@pytest.mark.slow
+def test_fov_benchmark():
+    from kelte.fov import cast_view, compute_fov
+    from kelte.maths import Position
+    from kelte.procgen import Level, Room
+    from kelte.tiles import get_tile
+
+    get_tile("wall", opaque=True)
+    get_tile("floor", walkable=True)
+    rooms = [Room(position=Position(x, y), width=12, height=8) for x in range(1, 70, 15) for y in range(1, 35, 10)]
+    level = Level(80, 43, rooms=rooms)
+    for position, tile in level:
+        tile.lit = True
+    origin = rooms[5].center
+
+    start = time.perf_counter()
+    legacy = set(cast_view(origin, level))
+    legacy_time = time.perf_counter() - start
+
+    timings = {}
+    transparency = level.transparency
+    for engine in ["shadowcasting", "permissive"]:
+        start = time.perf_counter()
+        for _ in range(10):
+            visible = compute_fov(transparency, origin, engine=engine)
+        timings[engine] = (time.perf_counter() - start) / 10
+        assert visible[origin.y, origin.x]
+
+    print(f"\ncast_view: {legacy_time * 1000:.2f}ms ({len(legacy)} cells)")
+    for engine, value in timings.items():
+        print(f"{engine}: {value * 1000:.2f}ms ({legacy_time / value:.0f}x)")
+        assert value < legacy_time
@@ -0,0 +1,51 @@
+import pytest
+
+# budgets are cumulative seconds and deliberately loose; the unwanted
+# modules are the part that should never regress
+startup_unwanted = ["scipy", "PIL", "freetype", "fontTools", "fuzzywuzzy", "colr", "kelte.maths.graphs", "kelte.maths.noise"]
+
+
+def _importtime(module):
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(Path(__file__).parent.parent),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        check=True,
+    )
+    timings = {}
+    for line in result.stderr.decode("utf-8").splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        timings[name.strip()] = int(cumulative) / 1e6
+    return timings
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"module": "kelte", "budget": 1.5, "unwanted": startup_unwanted},
+        {"module": "kelte.typeface", "budget": 1.5, "unwanted": ["PIL", "freetype", "fontTools", "fuzzywuzzy"]},
+        {"module": "kelte.procgen.rooms", "budget": 1.5, "unwanted": ["scipy"]},
+    ],
+)
+def test_importtime(data):
+    timings = _importtime(data["module"])
+    imported = {name.split(".")[0] for name in timings} | set(timings)
+    assert not imported & set(data["unwanted"])
+    assert timings[data["module"]] < data["budget"]
+
+
+def test_lazy_maths_exports():
+    import kelte.maths as maths
+
+    assert "Noise" in dir(maths)
+    assert maths.Noise is maths.noise.Noise
+    assert maths.CSRGraph is maths.graphs.CSRGraph
+    with pytest.raises(AttributeError):
+        maths.missing
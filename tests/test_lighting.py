@@ -0,0 +1,77 @@
+import pytest
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"intensity": 2048, "threshold": 10, "gradient": [512, 128, 56, 32, 20, 14, 10]},
+        {"intensity": 256, "threshold": 10, "gradient": [256, 64, 28, 16, 10]},
+        {"intensity": 2048, "threshold": 600, "gradient": []},
+    ],
+)
+def test_intensity_gradient(data):
+    from kelte.lighting import intensity_gradient
+
+    assert intensity_gradient(data["intensity"], data["threshold"]) == data["gradient"]
+
+
+def test_falloff_kernel():
+    from kelte.lighting import falloff_kernel, intensity_gradient
+
+    gradient = intensity_gradient(2048, 10)
+    kernel = falloff_kernel(gradient, 2048)
+    radius = len(gradient)
+    scale = 2048 / (radius * 2)
+
+    assert kernel.shape == (2 * radius + 1, 2 * radius + 1)
+    assert kernel[radius, radius] == gradient[0] / scale
+    assert kernel[radius, radius + 2] == gradient[2] / scale
+    assert kernel[radius + 3, radius + 3] == gradient[3] / scale
+    # outside of the light's circle
+    assert kernel[radius + 6, radius + 6] == 0
+    assert kernel[radius, 0] == 0
+
+
+@pytest.mark.parametrize("data", [{"seed": 0}, {"seed": 3}, {"seed": 4}, {"seed": 5}])
+def test_illuminate_matches_cast_light(data, game_data):
+    import random
+
+    import numpy as np
+
+    from kelte.colors import Color
+    from kelte.lighting import LightSource, cast_light, shade
+    from kelte.procgen import create_level
+    from kelte.tiles.grid import palette_array
+
+    random.seed(data["seed"])
+    level = create_level(60, 45)
+    position = level.rooms[0].center
+    transparency = level.transparency
+    for cell, entity in level.entities.items():
+        if entity.tile.opaque:
+            transparency[cell.y, cell.x] = False
+
+    # a fresh colour; other tests may have changed the registered ones
+    color = Color(0.5, 0.5, 0.5)
+    light = LightSource(color=color)
+    x0, y0, patch = light.illuminate(position, transparency)
+    lit = {(x0 + x, y0 + y): patch[y, x] for y, x in zip(*np.nonzero(patch))}
+    legacy = {}
+    for cell, tint, intensity in cast_light(position, level, color=color):
+        legacy.setdefault(tuple(cell), (tint, intensity))
+
+    # shadowcasting and the legacy bresenham rays only disagree on a few
+    # cells where a ray grazes a wall corner
+    differences = lit.keys() ^ legacy.keys()
+    assert len(differences) <= 0.02 * len(legacy)
+    for x, y in differences:
+        assert not transparency[max(0, y - 1):y + 2, max(0, x - 1):x + 2].all()
+
+    # everywhere else the light and its colour are exactly the legacy ones
+    for x, y in lit.keys() & legacy.keys():
+        tint, intensity = legacy[x, y]
+        assert lit[x, y] == intensity
+        tile = level[x, y]
+        expected = tile.lit_color * intensity + tint
+        base = palette_array("lit_color")[level.tiles.ids[y, x]]
+        assert shade(base, lit[x, y], light.tint).tolist() == [expected.red, expected.green, expected.blue]
@@ -0,0 +1,105 @@
+import pytest
+
+
+class PointLight:
+    # lights up a plus shape around its position
+    def __init__(self, tint):
+        self.tint = tint
+
+    def illuminate(self, position, transparency):
+        import numpy as np
+
+        height, width = transparency.shape
+        x, y = position
+        x0, y0 = max(0, x - 1), max(0, y - 1)
+        x1, y1 = min(width, x + 2), min(height, y + 2)
+        patch = np.zeros((y1 - y0, x1 - x0))
+        for dx, dy in [(0, 0), (-1, 0), (1, 0), (0, -1), (0, 1)]:
+            if x0 <= x + dx < x1 and y0 <= y + dy < y1 and transparency[y + dy, x + dx]:
+                patch[y + dy - y0, x + dx - x0] = 1.0
+        return x0, y0, patch
+
+
+def accumulate(lights, transparency):
+    # reference: add up every light from scratch
+    import numpy as np
+
+    intensity = np.zeros(transparency.shape)
+    tint = np.zeros(transparency.shape + (3,))
+    for light, position in lights:
+        x0, y0, patch = light.illuminate(position, transparency)
+        h, w = patch.shape
+        intensity[y0:y0 + h, x0:x0 + w] += patch
+        tint[y0:y0 + h, x0:x0 + w] += (patch > 0)[..., None] * light.tint
+    return intensity, tint
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"static": [(1, 1)], "dynamic": [(5, 3)], "moves": [(6, 3), (2, 1), (0, 0)]},
+        {"static": [], "dynamic": [(0, 0), (1, 0)], "moves": [(9, 5), (1, 1)]},
+        {"static": [(4, 2), (5, 2)], "dynamic": [(4, 3)], "moves": [(4, 3), (3, 3)]},
+    ],
+)
+def test_light_map_accumulation(data):
+    import numpy as np
+
+    from kelte.lightmap import LightMap
+
+    transparency = np.ones((6, 10), dtype=bool)
+    light_map = LightMap(10, 6)
+    light = PointLight(np.array([0.1, 0.2, 0.3]))
+    positions = {}
+    for index, position in enumerate(data["static"]):
+        light_map.add(("static", index), light, position, static=True)
+        positions[("static", index)] = position
+    for index, position in enumerate(data["dynamic"]):
+        light_map.add(("dynamic", index), light, position)
+        positions[("dynamic", index)] = position
+
+    changed = light_map.update(transparency)
+    intensity, tint = accumulate([(light, p) for p in positions.values()], transparency)
+    assert changed.tolist() == (intensity > 0).tolist()
+    assert np.array_equal(light_map.intensity, intensity)
+
+    for position in data["moves"]:
+        previous = light_map.intensity.copy()
+        light_map.move(("dynamic", 0), position)
+        positions[("dynamic", 0)] = position
+        changed = light_map.update(transparency)
+        intensity, tint = accumulate([(light, p) for p in positions.values()], transparency)
+        assert np.array_equal(light_map.intensity, intensity)
+        assert np.allclose(light_map.tint, tint)
+        assert changed.tolist() == (previous != intensity).tolist()
+
+    light_map.remove(("dynamic", 0))
+    positions.pop(("dynamic", 0))
+    light_map.update(transparency)
+    intensity, tint = accumulate([(light, p) for p in positions.values()], transparency)
+    assert np.array_equal(light_map.intensity, intensity)
+
+
+@pytest.mark.parametrize("data", [{"static": False}, {"static": True}])
+def test_light_map_blocked(data):
+    import numpy as np
+
+    from kelte.lightmap import LightMap
+
+    transparency = np.ones((5, 5), dtype=bool)
+    light_map = LightMap(5, 5)
+    light_map.add("torch", PointLight(np.zeros(3)), (2, 2), static=data["static"])
+    light_map.update(transparency)
+    assert light_map.intensity[2, 3] == 1
+
+    # an opaque mob steps next to the light
+    transparency[2, 3] = False
+    changed = light_map.update(transparency)
+    assert light_map.intensity[2, 3] == 0
+    assert np.argwhere(changed).tolist() == [[2, 3]]
+
+    # and steps away again
+    transparency[2, 3] = True
+    changed = light_map.update(transparency)
+    assert light_map.intensity[2, 3] == 1
+    assert np.argwhere(changed).tolist() == [[2, 3]]
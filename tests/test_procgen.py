@@ -0,0 +1,159 @@
+import pytest
+
+
+def _summary(level):
+    return (
+        level.grid.data.tobytes(),
+        [(room.x, room.y, room.width, room.height, [tuple(door) for door in room.doors]) for room in level.rooms],
+        [[tuple(position) for position, _ in cooridor] for cooridor in level.cooridors],
+        sorted((tuple(position), entity.name, entity.type) for position, entity in level.entities.items()),
+    )
+
+
+@pytest.mark.parametrize("data", [{"seed": 3, "width": 40, "height": 30}, {"seed": 11, "width": 30, "height": 45}])
+def test_level_encoding_roundtrip(data, game_data):
+    import random
+
+    from kelte.procgen import create_level, decode_level, encode_level
+
+    random.seed(data["seed"])
+    level = create_level(data["width"], data["height"])
+    encoded = encode_level(level)
+    assert encoded["ids"].shape == (data["height"], data["width"])
+
+    decoded = decode_level(encoded)
+    assert _summary(decoded) == _summary(level)
+    assert str(decoded) == str(level)
+
+
+def test_parallel_dungeon_is_deterministic(game_data):
+    import random
+
+    from kelte.procgen import create_dungeon
+
+    random.seed(0)
+    state = random.getstate()
+    serial = create_dungeon(2, 40, 30, seed=7, processes=1)
+    pooled = create_dungeon(2, 40, 30, seed=7, processes=2)
+    assert random.getstate() == state
+    assert [_summary(level) for level in serial] == [_summary(level) for level in pooled]
+    assert _summary(create_dungeon(2, 40, 30, seed=8, processes=1)[0]) != _summary(serial[0])
+
+    # every level starts from a room of the level before it
+    for previous, level in zip(serial, serial[1:]):
+        seed_room = level.rooms[0]
+        assert (seed_room.x, seed_room.y, seed_room.width, seed_room.height) in [
+            (room.x, room.y, room.width, room.height) for room in previous.rooms
+        ]
+
+
+@pytest.mark.parametrize("data", [{"processes": 0}, {"processes": 1}])
+def test_lazy_dungeon_matches_eager(data, game_data):
+    from kelte.procgen import LazyDungeon, create_dungeon
+
+    eager = create_dungeon(3, 40, 30, seed=5, processes=1)
+    with LazyDungeon(3, 40, 30, seed=5, processes=data["processes"]) as dungeon:
+        assert len(dungeon) == 3
+        assert not dungeon.built(0)
+        assert _summary(dungeon[0]) == _summary(eager[0])
+        assert dungeon[0] is dungeon[0]
+        assert dungeon.built(1) is False
+        assert (1 in dungeon._pending) is bool(data["processes"])
+        assert [_summary(level) for level in dungeon] == [_summary(level) for level in eager]
+        assert _summary(dungeon[-1]) == _summary(eager[-1])
+        with pytest.raises(IndexError):
+            dungeon[3]
+
+
+@pytest.mark.parametrize("data", [{"seed": 0}, {"seed": 1}, {"seed": 2}, {"seed": 9}])
+def test_place_doors_matches_create_door(data, game_data):
+    import random
+
+    import numpy as np
+
+    from kelte.procgen import Cooridor, create_door, create_layout, place_doors
+
+    def build():
+        random.seed(data["seed"])
+        level = create_layout(60, 45)
+        for index, room in enumerate(level.rooms):
+            level.cooridors.append(Cooridor(level.rooms[index - 1], room))
+        return level
+
+    expected = build()
+    for position, tile in expected:
+        door = create_door(position, tile, expected)
+        if door:
+            expected[position] = door
+    expected_state = random.getstate()
+
+    level = build()
+    doors = place_doors(level)
+    assert random.getstate() == expected_state
+    assert doors.any()
+    assert np.array_equal(level.grid.data, expected.grid.data)
+    names = {level[x, y].name for y, x in np.argwhere(doors)}
+    assert names <= {"closed door", "hidden door"}
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"room": (5, 5, 4, 3), "other": (9, 5, 3, 3), "margin": None, "overlaps": False},
+        {"room": (5, 5, 4, 3), "other": (9, 5, 3, 3), "margin": 1, "overlaps": True},
+        {"room": (5, 5, 4, 3), "other": (1, 5, 4, 3), "margin": None, "overlaps": True},
+        {"room": (5, 5, 4, 3), "other": (5, 1, 4, 3), "margin": None, "overlaps": False},
+        {"room": (5, 5, 4, 3), "other": (5, 10, 4, 3), "margin": 2, "overlaps": False},
+        {"room": (5, 5, 4, 3), "other": (6, 6, 1, 1), "margin": None, "overlaps": True},
+    ],
+)
+def test_room_placer_overlaps(data, game_data):
+    from kelte.maths import Position
+    from kelte.procgen import Room
+    from kelte.procgen.rooms import RoomPlacer
+
+    def room(x, y, width, height):
+        return Room(width=width, height=height, position=Position(x, y))
+
+    placed, other = room(*data["room"]), room(*data["other"])
+    placer = RoomPlacer(20, 20, margin=data["margin"])
+    placer.add(placed)
+    assert placer.overlaps(other) is data["overlaps"]
+    if data["margin"] is None:
+        assert (other in placed) is data["overlaps"]  # the rule Room.__contains__ applies
+
+    free = placer.free_positions(other.width, other.height)
+    assert free[other.y, other.x] == (not data["overlaps"])
+
+
+def test_dense_room_placement(game_data):
+    import random
+
+    from kelte.procgen import create_layout
+    from kelte.procgen.rooms import RoomPlacer
+
+    random.seed(4)
+    level = create_layout(150, 100, density=0.4, margin=1)
+    assert len(level.rooms) >= 50
+
+    placer = RoomPlacer(150, 100, margin=1)
+    for room in level.rooms:
+        assert placer.fits(room)
+        placer.add(room)
+    assert placer.density >= 0.4
+
+    capped = create_layout(150, 100, room_count=10, density=0.9, margin=1)
+    assert len(capped.rooms) == 10
+
+
+@pytest.mark.parametrize("data", [{"density": 0.0}, {"density": 0.01}, {"density": 0.02}])
+def test_sparse_levels(data, game_data):
+    import random
+
+    from kelte.procgen import create_level
+
+    # fewer rooms than the minimum mob and item counts
+    for seed in range(5):
+        random.seed(seed)
+        level = create_level(60, 40, density=data["density"])
+        assert len(level.rooms) < 3
@@ -0,0 +1,71 @@
+import pytest
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"storage": "array", "masked": False},
+        {"storage": "array", "masked": True},
+        {"storage": "list", "masked": False},
+    ],
+)
+def test_render_level(data):
+    import tcod
+
+    from kelte.config import settings
+    from kelte.maths import Position
+    from kelte.procgen import Level, Room
+    from kelte.rendering import render_level, render_tile
+    from kelte.tiles import get_tile
+
+    get_tile("wall", opaque=True)
+    get_tile("floor", walkable=True)
+
+    rooms = [Room(position=Position(1, 1), width=4, height=3)]
+    level = Level(10, 8, rooms=rooms, storage=data["storage"])
+    for index, (position, tile) in enumerate(level):
+        tile.explored = index % 2 == 0
+        tile.visible = index % 3 == 0
+        tile.lit = index % 5 != 0
+
+    mapper, console = settings.typeface_mapper, settings.main_console
+    settings.typeface_mapper = {chr(value): value for value in range(256)}
+    try:
+        expected = settings.main_console = tcod.console.Console(level.width, level.height)
+        actual = tcod.console.Console(level.width, level.height)
+        mask = level.walkability if data["masked"] else None
+        for position, tile in level:
+            if mask is None or mask[position.y, position.x]:
+                render_tile(position, tile)
+        render_level(level, mask, console=actual)
+    finally:
+        settings.typeface_mapper, settings.main_console = mapper, console
+
+    assert (expected.ch == actual.ch).all()
+    assert (expected.fg == actual.fg).all()
+    assert (expected.bg == actual.bg).all()
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"cells": [], "expected": 0},
+        {"cells": [(0, 0, "@")], "expected": 1},
+        {"cells": [(1, 2, "#"), (3, 0, ".")], "expected": 2},
+    ],
+)
+def test_frame_buffer(data):
+    from kelte.rendering import FrameBuffer
+
+    frame = FrameBuffer(4, 3)
+    for x, y, character in data["cells"]:
+        frame.back.ch[y, x] = ord(character)
+        frame.back.fg[y, x] = (255, 255, 0)
+
+    changed = frame.present()
+    assert changed.sum() == data["expected"]
+    assert frame.frames == (1 if data["expected"] else 0)
+
+    # nothing drawn since: the next frame is skipped
+    assert not frame.present().any()
+    assert frame.skipped == (2 if not data["expected"] else 1)
@@ -0,0 +1,58 @@
+import pytest
+
+
+class Thing:
+    def __init__(self, name, position=None):
+        self.name = name
+        self.position = position
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"positions": [(0, 0), (3, 2)], "query": (3, 2), "expected": ["1"]},
+        {"positions": [(1, 1), (1, 1), (1, 1)], "query": (1, 1), "expected": ["0", "1", "2"]},
+        {"positions": [(1, 1)], "query": (2, 2), "expected": []},
+        {"positions": [(1, 1)], "query": (-1, 9), "expected": []},
+    ],
+)
+def test_entity_index_lookup(data):
+    from kelte.maths import Position
+    from kelte.spatial import EntityIndex
+
+    index = EntityIndex(5, 4)
+    for name, position in enumerate(data["positions"]):
+        index.add(Thing(str(name)), Position(*position))
+
+    query = Position(*data["query"])
+    assert [thing.name for thing in index.at(query)] == data["expected"]
+    top = index.get(query)
+    assert (top.name if top else None) == (data["expected"][-1] if data["expected"] else None)
+    assert (query in index) == bool(data["expected"])
+    assert len(index) == len(data["positions"])
+
+
+def test_entity_index_moves():
+    from kelte.maths import Position
+    from kelte.spatial import EntityIndex
+
+    index = EntityIndex(6, 6)
+    a, b = Thing("a"), Thing("b")
+    index[Position(1, 1)] = a
+    index[Position(1, 1)] = b
+    assert index[Position(1, 1)] is b
+
+    index.move(b, Position(4, 4))
+    assert b.position == Position(4, 4)
+    assert index[Position(1, 1)] is a
+    assert index.stacks == {}
+    assert sorted(tuple(p) for p, _ in index.in_radius(Position(0, 0), 2)) == [(1, 1)]
+    assert sorted(tuple(p) for p, _ in index.in_rect(0, 0, 6, 6)) == [(1, 1), (4, 4)]
+
+    del index[Position(1, 1)]
+    assert Position(1, 1) not in index
+    assert [thing for thing in index.values()] == [b]
+    with pytest.raises(KeyError):
+        index[Position(1, 1)]
+    with pytest.raises(IndexError):
+        index.add(a, Position(6, 0))
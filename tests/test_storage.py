@@ -0,0 +1,55 @@
+import pytest
+
+
+def _summary(level):
+    return (
+        level.grid.data.tobytes(),
+        [(room.x, room.y, room.width, room.height, [tuple(door) for door in room.doors]) for room in level.rooms],
+        [[tuple(position) for position, _ in cooridor] for cooridor in level.cooridors],
+        sorted((tuple(position), entity.name, entity.type) for position, entity in level.entities.items()),
+    )
+
+
+@pytest.mark.parametrize("data", [{"seed": 3, "width": 40, "height": 30}, {"seed": 11, "width": 30, "height": 45}])
+def test_level_file_roundtrip(data, game_data, tmp_path):
+    import random
+
+    import numpy as np
+
+    from kelte.procgen import create_level
+    from kelte.procgen.storage import load_level, read_levels, save_level
+
+    random.seed(data["seed"])
+    level = create_level(data["width"], data["height"])
+    path = tmp_path / "level.kel"
+    save_level(level, path)
+
+    (encoded,) = read_levels(path)
+    assert isinstance(encoded["ids"], np.memmap)
+    assert encoded["ids"].shape == (data["height"], data["width"])
+    assert _summary(load_level(path)) == _summary(level)
+
+
+def test_dungeon_file_loads_lazily(game_data, tmp_path):
+    from kelte.procgen import create_dungeon
+    from kelte.procgen.storage import load_dungeon, save_dungeon
+
+    levels = create_dungeon(3, 40, 30, seed=5, processes=1)
+    path = tmp_path / "dungeon.kel"
+    save_dungeon(levels, path)
+
+    dungeon = load_dungeon(path)
+    assert len(dungeon) == 3
+    assert not dungeon.levels
+    assert _summary(dungeon[-1]) == _summary(levels[-1])
+    assert list(dungeon.levels) == [2]
+    assert [_summary(level) for level in dungeon] == [_summary(level) for level in levels]
+
+
+def test_rejects_other_files(tmp_path):
+    from kelte.procgen.storage import read_levels
+
+    path = tmp_path / "level.kel"
+    path.write_bytes(b"not a level")
+    with pytest.raises(ValueError):
+        read_levels(path)
@@ -0,0 +1,34 @@
+import pytest
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"frames": [[0, 1, 1], [0, 1, 1]], "expected": [0, 0, 0]},
+        {"frames": [[0, 1, 1], [1, 1, 0]], "expected": [1, 0, 1]},
+        {"frames": [[0.0, 0.5, 1.0], [0.0, 0.25, 1.0]], "expected": [0, 1, 0]},
+    ],
+)
+def test_visibility_cache_update(data):
+    import numpy as np
+
+    from kelte.visibility import VisibilityCache
+
+    cache = VisibilityCache()
+    first, second = (np.array(frame) for frame in data["frames"])
+
+    assert "player" not in cache
+    assert cache.update("player", first).tolist() == first.astype(bool).tolist()
+    assert cache.update("player", second).tolist() == [bool(v) for v in data["expected"]]
+    assert cache.forget("player").tolist() == second.astype(bool).tolist()
+    assert len(cache) == 0
+
+
+def test_dirty_cells():
+    import numpy as np
+
+    from kelte.visibility import dirty_cells
+
+    changed = np.zeros((3, 4), dtype=bool)
+    changed[1, 3] = changed[2, 0] = True
+    assert list(dirty_cells(changed)) == [(3, 1), (0, 2)]
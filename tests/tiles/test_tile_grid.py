@@ -0,0 +1,46 @@
+import pytest
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"name": "wall", "kwds": {"opaque": True}, "expected": {"opaque": True, "walkable": False}},
+        {"name": "floor", "kwds": {"walkable": True}, "expected": {"opaque": False, "walkable": True}},
+    ],
+)
+def test_tile_grid_view(data):
+    from kelte.tiles import TileGrid, get_tile
+
+    tile = get_tile(data["name"], **data["kwds"])
+    grid = TileGrid(4, 3, fill=tile)
+
+    view = grid[2, 1]
+    assert grid.nbytes == 4 * 3 * 3
+    assert view.name == data["name"]
+    assert view == tile
+    for key, value in data["expected"].items():
+        assert getattr(view, key) == value
+
+    view.explored = True
+    assert grid[2, 1].explored is True
+    assert grid[1, 2].explored is False
+    assert view.copy().explored is True
+
+
+def test_level_storage_modes():
+    from kelte.maths import Position
+    from kelte.procgen import Level, Room
+    from kelte.tiles import get_tile
+
+    get_tile("wall", opaque=True)
+    get_tile("floor", walkable=True)
+
+    rooms = [Room(position=Position(1, 1), width=4, height=3)]
+    levels = [Level(10, 8, rooms=list(rooms), storage=storage) for storage in ("list", "array")]
+    expected, actual = [[(tuple(p), t.name, t.walkable, t.opaque) for p, t in level] for level in levels]
+    assert expected == actual
+
+    level = levels[-1]
+    assert level[2, 2].walkable
+    assert level.walkability.sum() == 4 * 3
+    assert not level.transparency[0, 0]